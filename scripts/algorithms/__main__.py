@@ -0,0 +1,169 @@
+"""
+Command line entry point for the solvers:
+
+    cd scripts && python -m algorithms solve --algo aco --kaynak 0 --hedef 249
+    cd scripts && python -m algorithms table --kaynak 0 --hedef 249
+
+Without --kaynak/--hedef the endpoints, weights and algorithm parameters are
+read from the UI's input CSV (aco_input.csv / genetic_input.csv). The result
+is printed as one JSON line on stdout; the import, load and solve phase
+times go to stderr. networkx is not imported on this path.
+"""
+import time
+
+_baslangic = time.perf_counter()
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+
+# The solver modules use flat imports (from network_manager import ...)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from iteration_trace import profille
+from network_manager import NetworkManager
+from result_writer import json_safe
+from route_cache import RouteCache
+from solver import solve
+
+GIRDI_DOSYALARI = {"aco": "aco_input.csv", "ga": "genetic_input.csv"}
+
+
+def girdi_oku(dosya_yolu):
+    """Reads a parametre,deger CSV into a dict; empty if the file is missing."""
+    parametreler = {}
+    if not os.path.exists(dosya_yolu):
+        return parametreler
+    with open(dosya_yolu, newline="", encoding="utf-8") as f:
+        for satir in csv.DictReader(f):
+            if "parametre" in satir and "deger" in satir:
+                parametreler[satir["parametre"]] = satir["deger"]
+    return parametreler
+
+
+def parametre_ayristir(ciftler):
+    """Turns ["iterasyon=100", ...] into {"iterasyon": "100", ...}."""
+    params = {}
+    for cift in ciftler or []:
+        ad, ayrac, deger = cift.partition("=")
+        if not ayrac:
+            raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got: {cift}")
+        params[ad.strip()] = deger.strip()
+    return params
+
+
+def komut_solve(args, import_suresi):
+    yukleme_baslangic = time.perf_counter()
+    # Loader warnings must not end up in the JSON on stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        network = NetworkManager(data_folder=args.data, use_cache=not args.no_cache)
+    yukleme_suresi = time.perf_counter() - yukleme_baslangic
+
+    params = girdi_oku(os.path.join(network.data_folder, GIRDI_DOSYALARI[args.algo]))
+    params.update(parametre_ayristir(args.param))
+    if args.iz:
+        params["iz_dosyasi"] = args.iz
+    if args.tohum is not None:
+        params["tohum"] = args.tohum
+    kaynak = args.kaynak if args.kaynak is not None else int(float(params.get("kaynak", 0)))
+    hedef = args.hedef if args.hedef is not None else int(float(params.get("hedef", 249)))
+    agirliklar = args.agirliklar or [
+        float(params.get("agirlik_delay", 0.33)),
+        float(params.get("agirlik_reliability", 0.33)),
+        float(params.get("agirlik_cost", 0.34)),
+    ]
+    bw_talep = args.bw if args.bw is not None else float(params.get("bw_talep", 0))
+
+    cozum_baslangic = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stderr):
+        onbellek = None if args.no_route_cache else RouteCache.for_folder(network.data_folder)
+        cozucu = lambda: solve(network, args.algo, kaynak, hedef, agirliklar, params, bw_talep,
+                               onbellek=onbellek)
+        sonuc = profille(cozucu, args.profil) if args.profil is not None else cozucu()
+    cozum_suresi = time.perf_counter() - cozum_baslangic
+
+    sonuc["asamalar"] = {
+        "import": import_suresi,
+        "yukleme": yukleme_suresi,
+        "cozum": cozum_suresi,
+    }
+    print(json.dumps(json_safe(sonuc)), flush=True)
+    print(f"import: {import_suresi * 1000:.1f} ms | yukleme: {yukleme_suresi * 1000:.1f} ms"
+          f" | cozum: {cozum_suresi * 1000:.1f} ms"
+          f" | networkx yuklu: {'networkx' in sys.modules}", file=sys.stderr)
+    return 0
+
+
+def komut_table(args):
+    with contextlib.redirect_stdout(sys.stderr):
+        network = NetworkManager(data_folder=args.data, use_cache=not args.no_cache)
+    params = girdi_oku(os.path.join(network.data_folder, GIRDI_DOSYALARI["aco"]))
+    agirliklar = args.agirliklar or [
+        float(params.get("agirlik_delay", 0.33)),
+        float(params.get("agirlik_reliability", 0.33)),
+        float(params.get("agirlik_cost", 0.34)),
+    ]
+
+    baslangic = time.perf_counter()
+    tablo = network.routing_table(tuple(agirliklar), args.bw or 0, args.workers, args.cikti)
+    sonuc = {"klasor": tablo.folder, "dugum_sayisi": len(tablo.node_ids),
+             "agirliklar": agirliklar, "sure": time.perf_counter() - baslangic}
+    if args.kaynak is not None and args.hedef is not None:
+        sonuc["rota"] = tablo.lookup(args.kaynak, args.hedef)
+    print(json.dumps(json_safe(sonuc)), flush=True)
+    return 0
+
+
+def main(argv=None):
+    import_suresi = time.perf_counter() - _baslangic
+
+    parser = argparse.ArgumentParser(prog="python -m algorithms",
+                                     description="QoS routing solvers")
+    alt = parser.add_subparsers(dest="komut", required=True)
+
+    p = alt.add_parser("solve", help="Solve one source/target demand")
+    p.add_argument("--algo", choices=sorted(GIRDI_DOSYALARI), required=True)
+    p.add_argument("--kaynak", "--source", type=int, default=None)
+    p.add_argument("--hedef", "--target", type=int, default=None)
+    p.add_argument("--agirliklar", "--weights", type=float, nargs=3, default=None,
+                   metavar=("DELAY", "RELIABILITY", "COST"))
+    p.add_argument("--bw", type=float, default=None, help="Bandwidth demand (Mbps)")
+    p.add_argument("--param", action="append", metavar="NAME=VALUE",
+                   help="Algorithm parameter override, e.g. iterasyon=100")
+    p.add_argument("--data", default=None, help="Topology folder (default: ../data)")
+    p.add_argument("--no-cache", action="store_true", help="Ignore the topology snapshot")
+    p.add_argument("--no-route-cache", action="store_true",
+                   help="Always run the search instead of returning a stored route")
+    p.add_argument("--tohum", "--seed", type=int, default=None,
+                   help="RNG seed; the result reports the seed used either way")
+    p.add_argument("--iz", default=None, metavar="PATH",
+                   help="Per-iteration trace file (.jsonl, or .csv)")
+    p.add_argument("--profil", nargs="?", const="", default=None, metavar="PATH",
+                   help="Run the solve under cProfile; optionally dump stats to PATH")
+
+    p = alt.add_parser("table", help="Precompute the all-pairs routing table")
+    p.add_argument("--kaynak", "--source", type=int, default=None,
+                   help="With --hedef, also print this pair's route")
+    p.add_argument("--hedef", "--target", type=int, default=None)
+    p.add_argument("--agirliklar", "--weights", type=float, nargs=3, default=None,
+                   metavar=("DELAY", "RELIABILITY", "COST"))
+    p.add_argument("--bw", type=float, default=None, help="Bandwidth demand (Mbps)")
+    p.add_argument("--workers", type=int, default=None, help="Processes (default: all cores)")
+    p.add_argument("--cikti", "--output", default=None, metavar="DIR",
+                   help="Table folder (default: <data>/.cache/routing/<key>)")
+    p.add_argument("--data", default=None, help="Topology folder (default: ../data)")
+    p.add_argument("--no-cache", action="store_true", help="Ignore the topology snapshot")
+
+    args = parser.parse_args(argv)
+    if args.komut == "solve":
+        return komut_solve(args, import_suresi)
+    if args.komut == "table":
+        return komut_table(args)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
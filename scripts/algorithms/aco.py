@@ -1,7 +1,4 @@
-import networkx as nx
-import random
 import numpy as np
-import math
 import os
 import sys
 import csv
@@ -10,6 +7,11 @@ import time
 # Import NetworkManager directly since it is in the same folder
 try:
     from network_manager import NetworkManager
+    from iteration_trace import IterasyonIzi
+    from stopping import DurmaKosulu, feromon_entropisi
+    from seeding import tohum_oku, yeni_tohum
+    from route_cache import RouteCache, route_key
+    from result_writer import build_result, write_legacy_csv, write_result
 except ImportError:
     print("Error: network_manager.py must be in the same folder as this script.")
     sys.exit(1)
@@ -49,29 +51,13 @@ def csvden_parametreleri_oku(dosya_adi=r"../data/aco_input.csv"):
     return parametreler
 
 
-def export_path_csv(yol, dosya_adi=r"../data/aco_path.csv"):
-    """
-    Exports the found path to a clean, minimalist CSV file.
-    Format: step, node_id
-    """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    abs_path = os.path.abspath(os.path.join(current_dir, dosya_adi))
-
-    try:
-        with open(abs_path, mode="w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["step", "node_id"])
-            for step, node in enumerate(yol):
-                writer.writerow([step, node])
-    except Exception as e:
-        print(f"Warning: Failed to export path csv: {e}")
-
-
 class KarincaKolonisiOptimizasyonu:
     def __init__(self, network, agirliklar, karinca_sayisi=30, iterasyon_sayisi=50,
-                 alfa=1.0, beta=2.0, buharlasma_orani=0.1, q_degeri=100.0):
+                 alfa=1.0, beta=2.0, buharlasma_orani=0.1, q_degeri=100.0, toplu=True,
+                 bw_talep=0, baslangic_yollari=None, tohum=None, durma=None, iz=None,
+                 sicak_sifirlama=0.8, aday_sayisi=0, maks_min=False):
         self.manager = network
-        self.grafik = network.G
+        self.cg = network.compiled
         self.agirliklar = agirliklar
         self.karinca_sayisi = karinca_sayisi
         self.iterasyon_sayisi = iterasyon_sayisi
@@ -79,56 +65,176 @@ class KarincaKolonisiOptimizasyonu:
         self.beta = beta
         self.buharlasma_orani = buharlasma_orani
         self.q_degeri = q_degeri
+        # Batched mode moves the whole colony at once over the CSR arrays
+        self.toplu = toplu
+        self.rng = np.random.default_rng(tohum)
+
+        # Candidate lists: ants look at the aday_sayisi neighbors closest to
+        # the target first and at the full neighborhood only when those are
+        # used up. 0 (the default) always offers the full neighborhood; 4
+        # gave the best paths on the benchmark graphs (250-2000 nodes)
+        self.aday_sayisi = int(aday_sayisi or 0)
+        # MAX-MIN Ant System bounds instead of the fixed 0.01 floor. Off by
+        # default: runs take 2-3x longer, and it is not better than the plain
+        # floor on every topology (it was worse on some dense graphs)
+        self.maks_min = maks_min
+        self.sinirlari_sifirla()
+
+        # eta per CSR slot (shared per weight vector), tau per undirected edge
+        self.sezgisel_guncelle()
         self.feromonlari_baslat()
 
-    def feromonlari_baslat(self):
-        """Initial pheromone setup on edges."""
-        for u, v in self.grafik.edges():
-            if 'feromon' not in self.grafik[u][v]:
-                self.grafik[u][v]['feromon'] = 1.0
-
-    def sezgisel_hesapla(self, u, v):
-        """Calculates edge desirability based on delay, reliability, and cost."""
-        w_d, w_r, w_res = self.agirliklar
-        edge = self.grafik[u][v]
-        node = self.grafik.nodes[v]
-
-        local_delay = edge.get('link_delay', 10.0) + node.get('processing_delay', 1.0)
+        # Edges without enough residual bandwidth are never offered to an ant
+        self.bw_talep = bw_talep
+        self.kapasite_guncelle()
+
+        # Known good paths (e.g. the exact optimum) that pre-mark the pheromone
+        self.baslangic_yollari = baslangic_yollari or []
+        # Early stopping; the default runs every iteration
+        self.durma = durma or DurmaKosulu()
+        # Optional IterasyonIzi: one record per iteration with phase timings
+        self.iz = iz
+        # Graph version and endpoints of the last run, for warm starts
+        self.sicak_sifirlama = sicak_sifirlama
+        self._surum = None
+        self._uclar = None
+
+    def kapasite_guncelle(self):
+        """Re-reads the residual bandwidth; call after reservations change."""
+        self.uygun_kenar = self.cg.feasible_edges(self.bw_talep)
+        self._aday_hedefi = None
 
-        rel_score = edge.get('reliability', 0.99) * node.get('reliability', 0.99)
-        local_rel_cost = -math.log(rel_score) if rel_score > 0 else 100
-
-        bw = edge.get('bandwidth', 100)
-        local_res_cost = 1000.0 / bw if bw > 0 else 100
-
-        total_local_cost = (w_d * local_delay) + (w_r * local_rel_cost) + (w_res * local_res_cost)
-        return 1.0 / total_local_cost if total_local_cost > 0 else 0.0001
+    def feromonlari_baslat(self):
+        """Fresh pheromone array for a run; the shared graph is never touched."""
+        self.feromon = np.ones(self.cg.edge_count)
+
+    def cozum_olustur_toplu(self, kaynak, hedef):
+        """
+        Constructs paths for all ants at once.
+        Each step handles every active ant with one RNG call; returns one
+        path (or None) per ant.
+        """
+        cg = self.cg
+        karinca = self.karinca_sayisi
+        bas_idx, hedef_idx = cg.to_index([kaynak, hedef])
+        if bas_idx < 0 or hedef_idx < 0:
+            return [None] * karinca
+        if bas_idx == hedef_idx:
+            return [[kaynak] for _ in range(karinca)]
+
+        n = cg.node_count
+        komsu_matrisi, slot_matrisi = cg.padded_adjacency()
+        agirlik = (self.feromon[cg.slot_edge] ** self.alfa) * self.sezgisel_beta
+        agirlik[~self.uygun_kenar[cg.slot_edge]] = 0.0
+        if self.aday_sayisi:
+            # Only the candidate columns are scanned at every step; the full
+            # rows are gathered just for ants whose candidates are used up
+            aday_agirlik = np.where(self.aday_slot >= 0, agirlik[self.aday_slot], 0.0)
+        else:
+            agirlik_matrisi = np.where(slot_matrisi >= 0, agirlik[slot_matrisi], 0.0)
+
+        # Visited bitmask, one row per ant; column n is the padding sentinel.
+        # Steps index the flat view: a 1-D take is cheaper than a 2-D gather
+        ziyaret_edilenler = np.zeros((karinca, n + 1), dtype=bool)
+        ziyaret_edilenler[:, n] = True
+        ziyaret_edilenler[:, bas_idx] = True
+        ziyaret = ziyaret_edilenler.ravel()
+        mevcut = np.full(karinca, bas_idx, dtype=np.int64)
+        # Column `adim` holds every ant's node after that step; only the
+        # columns before an ant's arrival are ever read back
+        adimlar = np.empty((karinca, n), dtype=np.int64)
+        adimlar[:, 0] = bas_idx
+        uzunluk = np.zeros(karinca, dtype=np.int64)  # 0 = not arrived
+        aktif = np.arange(karinca)
+
+        for adim in range(1, n):
+            dugum = mevcut[aktif]
+            taban = aktif[:, None] * (n + 1)
+            # One uniform draw per active ant
+            u = self.rng.random(len(aktif))
+            if self.aday_sayisi:
+                komsular = self.aday_komsu[dugum]
+                w = aday_agirlik[dugum]
+                w[ziyaret.take(taban + komsular)] = 0.0
+                sonraki = self._rulet(w, komsular, u)
+                geri = np.flatnonzero(sonraki < 0)
+                if geri.size:
+                    komsular = komsu_matrisi[dugum[geri]]
+                    w = np.where(slot_matrisi[dugum[geri]] >= 0,
+                                 agirlik[slot_matrisi[dugum[geri]]], 0.0)
+                    w[ziyaret.take(taban[geri] + komsular)] = 0.0
+                    sonraki[geri] = self._rulet(w, komsular, u[geri])
+            else:
+                komsular = komsu_matrisi[dugum]
+                w = agirlik_matrisi[dugum]
+                w[ziyaret.take(taban + komsular)] = 0.0
+                sonraki = self._rulet(w, komsular, u)
+
+            canli = sonraki >= 0
+            hareket = aktif[canli]
+            sonraki = sonraki[canli]
+            mevcut[hareket] = sonraki
+            ziyaret[hareket * (n + 1) + sonraki] = True
+            adimlar[hareket, adim] = sonraki
+
+            vardi = sonraki == hedef_idx
+            uzunluk[hareket[vardi]] = adim + 1
+            aktif = hareket[~vardi]
+            if aktif.size == 0:
+                break
+
+        yollar = []
+        for k in range(karinca):
+            if uzunluk[k]:
+                yollar.append(cg.node_ids[adimlar[k, :uzunluk[k]]].tolist())
+            else:
+                yollar.append(None)
+        return yollar
+
+    @staticmethod
+    def _rulet(w, komsular, u):
+        """Roulette wheel per row of `w` with uniforms `u`; the chosen neighbor, or -1 if none is left."""
+        # `w` is a fresh gather, so the running sum can overwrite it
+        kumulatif = w.cumsum(axis=1, out=w)
+        payda = kumulatif[:, -1]
+        # Kept below the row total so rounding never lands past the last
+        # positive weight; the first entry above it then always has weight > 0
+        esik = np.minimum(u * payda, np.nextafter(payda, 0.0))
+        secim = (kumulatif > esik[:, None]).argmax(axis=1)
+        return np.where(payda > 0, komsular[np.arange(len(w)), secim], -1)
 
     def cozum_olustur(self, kaynak, hedef):
         """Constructs a single ant's path through the network."""
-        mevcut = kaynak
+        cg = self.cg
+        mevcut, hedef_idx = cg.to_index([kaynak, hedef])
+        if mevcut < 0 or hedef_idx < 0:
+            return None
         yol = [mevcut]
         ziyaret_edilenler = {mevcut}
-        max_adim = len(self.grafik.nodes) * 2
+        max_adim = cg.node_count * 2
 
         for _ in range(max_adim):
-            if mevcut == hedef: return yol
-
-            komsular = [n for n in self.grafik.neighbors(mevcut) if n not in ziyaret_edilenler]
-            if not komsular: return None
-
-            olasiliklar = []
-            for komsu in komsular:
-                tau = self.grafik[mevcut][komsu].get('feromon', 1.0)
-                eta = self.sezgisel_hesapla(mevcut, komsu)
-                olasiliklar.append(math.pow(tau, self.alfa) * math.pow(eta, self.beta))
-
-            payda = sum(olasiliklar)
+            if mevcut == hedef_idx: return cg.node_ids[yol].tolist()
+
+            slotlar = []
+            if self.aday_sayisi:
+                slotlar = [s for s in self.aday_slot[mevcut] if s >= 0
+                           and cg.indices[s] not in ziyaret_edilenler
+                           and self.uygun_kenar[cg.slot_edge[s]]]
+            if not slotlar:
+                slotlar = np.arange(cg.indptr[mevcut], cg.indptr[mevcut + 1])
+                slotlar = [s for s in slotlar if cg.indices[s] not in ziyaret_edilenler
+                           and self.uygun_kenar[cg.slot_edge[s]]]
+            if not slotlar: return None
+
+            olasiliklar = (self.feromon[cg.slot_edge[slotlar]] ** self.alfa) * \
+                self.sezgisel_beta[slotlar]
+
+            payda = olasiliklar.sum()
             if payda == 0:
-                secilen = random.choice(komsular)
+                secilen = cg.indices[self.rng.choice(slotlar)]
             else:
-                olasiliklar = [p / payda for p in olasiliklar]
-                secilen = np.random.choice(komsular, p=olasiliklar)
+                secilen = cg.indices[self.rng.choice(slotlar, p=olasiliklar / payda)]
 
             yol.append(secilen)
             ziyaret_edilenler.add(secilen)
@@ -137,42 +243,197 @@ class KarincaKolonisiOptimizasyonu:
 
     def feromon_guncelle(self, yollar_ve_maliyetler):
         """Applies evaporation and updates pheromones for successful paths."""
-        for u, v in self.grafik.edges():
-            self.grafik[u][v]['feromon'] *= (1.0 - self.buharlasma_orani)
-            if self.grafik[u][v]['feromon'] < 0.01: self.grafik[u][v]['feromon'] = 0.01
-
-        for yol, maliyet in yollar_ve_maliyetler:
-            if maliyet > 0 and maliyet != float('inf'):
-                birakilacak_miktar = self.q_degeri / maliyet
-                for i in range(len(yol) - 1):
-                    u, v = yol[i], yol[i + 1]
-                    self.grafik[u][v]['feromon'] += birakilacak_miktar
-
-    def calistir(self, kaynak, hedef):
-        """Main iterative loop for the ACO algorithm."""
+        self.feromon *= (1.0 - self.buharlasma_orani)
+        if not self.maks_min:
+            np.maximum(self.feromon, self.feromon_alt, out=self.feromon)
+            self.feromon_birak(yollar_ve_maliyetler)
+            return
+        self.feromon_birak(yollar_ve_maliyetler)
+        self.sinirlari_guncelle(yollar_ve_maliyetler)
+        np.clip(self.feromon, self.feromon_alt, self.feromon_ust, out=self.feromon)
+
+    def sinirlari_sifirla(self):
+        """Back to the plain 0.01 floor until the next run finds a path."""
+        self.feromon_alt = 0.01
+        self.feromon_ust = float('inf')
+        self._en_iyi_maliyet = float('inf')
+
+    def sinir_durumu(self):
+        """MAX-MIN state (bounds and best cost), so a colony can move between processes."""
+        return self.feromon_alt, self.feromon_ust, self._en_iyi_maliyet
+
+    def sinir_durumu_yukle(self, durum):
+        self.feromon_alt, self.feromon_ust, self._en_iyi_maliyet = durum
+
+    def sinirlari_guncelle(self, yollar_ve_maliyetler):
+        """
+        MAX-MIN bounds from the best cost so far (Stuetzle & Hoos):
+        tau_max = q / (rho * best) and tau_min = tau_max (1 - p) / ((avg - 1) p),
+        with p = 0.05^(1/n) the per-decision probability of rebuilding the best
+        path over n nodes and avg the mean candidate-list size.
+        """
+        gecerli = [maliyet for _, maliyet in yollar_ve_maliyetler
+                   if 0 < maliyet < self._en_iyi_maliyet]
+        if not gecerli:
+            return
+        self._en_iyi_maliyet = min(gecerli)
+        self.feromon_ust = self.q_degeri / (self.buharlasma_orani * self._en_iyi_maliyet)
+        p = 0.05 ** (1.0 / max(self.cg.node_count, 2))
+        self.feromon_alt = min(self.feromon_ust * (1.0 - p) / ((self._ort_secenek - 1.0) * p),
+                               self.feromon_ust)
+
+    def feromon_birak(self, yollar_ve_maliyetler):
+        """Deposits q / cost on every edge of each valid path."""
+        gecerli = [(yol, maliyet) for yol, maliyet in yollar_ve_maliyetler
+                   if maliyet > 0 and maliyet != float('inf')]
+        if not gecerli:
+            return
+        sahip, kenarlar = self.cg.path_edges([yol for yol, _ in gecerli])
+        miktarlar = self.q_degeri / np.array([maliyet for _, maliyet in gecerli])
+        np.add.at(self.feromon, kenarlar, miktarlar[sahip])
+
+    def sezgisel_guncelle(self):
+        self.sezgisel = self.cg.heuristic(self.agirliklar)
+        self.sezgisel_beta = self.sezgisel ** self.beta
+        # Choices per step for tau_min: the candidate list, or the mean degree
+        self._ort_secenek = max(2.0 * self.cg.edge_count / max(self.cg.node_count, 1), 2.0)
+        # Candidate lists depend on eta and the target; rebuilt on next use
+        self._aday_hedefi = None
+
+    def aday_listesi_kur(self, hedef_idx):
+        """
+        (node_count, aday_sayisi) neighbor and slot matrices of every node's
+        best neighbors towards `hedef_idx`, padded with node_count / -1 like
+        padded_adjacency. Neighbors are ranked by hop distance to the target
+        (feasible links only), then by eta, so a short list still leads
+        somewhere instead of to the locally cheapest links.
+        """
+        cg = self.cg
+        n, k = cg.node_count, self.aday_sayisi
+        satir = np.repeat(np.arange(n), np.diff(cg.indptr))
+        mesafe = cg.hop_distances(int(hedef_idx), self.bw_talep)
+        # Slots grouped by node, closest to the target first, then best eta
+        sira = np.lexsort((-self.sezgisel, mesafe[cg.indices], satir))
+        derece = np.arange(len(sira)) - cg.indptr[satir]
+        tut = derece < k
+        self.aday_komsu = np.full((n, k), n, dtype=np.int64)
+        self.aday_slot = np.full((n, k), -1, dtype=np.int64)
+        self.aday_slot[satir[tut], derece[tut]] = sira[tut]
+        self.aday_komsu[satir[tut], derece[tut]] = cg.indices[sira[tut]]
+        self._ort_secenek = max(float((self.aday_slot >= 0).sum(axis=1).mean()), 2.0)
+        self._aday_hedefi = int(hedef_idx)
+
+    def hazirla(self):
+        """Fresh pheromone and capacity view for a run, seeded with baslangic_yollari."""
+        self.feromonlari_baslat()
+        self.sinirlari_sifirla()
+        self.sezgisel_guncelle()
+        self.kapasite_guncelle()
+        self._surum = self.cg.version
+        self.durma.baslat()
+        if self.baslangic_yollari:
+            maliyetler = self.manager.calculate_fitness_batch(
+                self.baslangic_yollari, self.agirliklar, self.bw_talep)["fitness"]
+            self.feromon_birak(list(zip(self.baslangic_yollari, maliyetler)))
+
+    def iterasyonlar(self, kaynak, hedef, iterasyon_sayisi):
+        """Runs `iterasyon_sayisi` iterations on the current pheromone; returns the best of them."""
         en_iyi_yol, en_iyi_fitness = None, float('inf')
-
-        for _ in range(self.iterasyon_sayisi):
+        hedef_idx = self.cg.to_index([hedef])[0]
+        if self.aday_sayisi and hedef_idx >= 0 and self._aday_hedefi != hedef_idx:
+            self.aday_listesi_kur(hedef_idx)
+        for _ in range(iterasyon_sayisi):
+            t_insa = time.perf_counter()
+            if self.toplu:
+                yollar = [yol for yol in self.cozum_olustur_toplu(kaynak, hedef) if yol]
+            else:
+                yollar = []
+                for _ in range(self.karinca_sayisi):
+                    yol = self.cozum_olustur(kaynak, hedef)
+                    if yol:
+                        yollar.append(yol)
+
+            # Score every ant of this iteration in one vectorized pass
+            t_fitness = time.perf_counter()
+            maliyetler = self.manager.calculate_fitness_batch(
+                yollar, self.agirliklar, self.bw_talep)["fitness"]
+            t_feromon = time.perf_counter()
             bu_iter_yollar = []
-            for _ in range(self.karinca_sayisi):
-                yol = self.cozum_olustur(kaynak, hedef)
-                if yol:
-                    res = self.manager.calculate_fitness(yol, self.agirliklar)
-                    maliyet = res["fitness"] if isinstance(res, dict) else res
-                    if maliyet < en_iyi_fitness:
-                        en_iyi_fitness, en_iyi_yol = maliyet, yol
-                    bu_iter_yollar.append((yol, maliyet))
+            for yol, maliyet in zip(yollar, maliyetler):
+                maliyet = float(maliyet)
+                if maliyet < en_iyi_fitness:
+                    en_iyi_fitness, en_iyi_yol = maliyet, yol
+                bu_iter_yollar.append((yol, maliyet))
             self.feromon_guncelle(bu_iter_yollar)
+
+            entropi = feromon_entropisi(self.feromon) if self.durma.min_entropi else None
+            dur = self.durma.kontrol(self.durma.iterasyon + 1, en_iyi_fitness, entropi=entropi)
+            if self.iz:
+                self.iz.kaydet(self.durma.iterasyon, maliyetler, self.karinca_sayisi, {
+                    "insa": t_fitness - t_insa,
+                    "fitness": t_feromon - t_fitness,
+                    "feromon": time.perf_counter() - t_feromon,
+                })
+            if dur:
+                break
         return en_iyi_yol, en_iyi_fitness
 
+    def sicak_hazirla(self):
+        """
+        Starts from the pheromone of the last run instead of a flat array.
+        Links changed since then, and the links around changed nodes, are
+        reset to the initial level. All trails are then scaled down and
+        pulled towards it by sicak_sifirlama (0 keeps them, 1 is a cold
+        start), so a converged colony can still leave a path that got worse.
+        """
+        cg = self.cg
+        ciftler, dugumler, esleme = cg.changes_since(self._surum)
+        if esleme is not None:
+            feromon = np.ones(cg.edge_count)
+            kalan = esleme >= 0
+            feromon[esleme[kalan]] = self.feromon[kalan]
+            self.feromon = feromon
+        if ciftler:
+            u, v = np.array(ciftler).T
+            slotlar = cg.find_slots(u, v)
+            self.feromon[cg.slot_edge[slotlar[slotlar >= 0]]] = 1.0
+        if dugumler:
+            self.feromon[cg.slot_edge[cg.neighbor_slots(np.array(dugumler))]] = 1.0
+        if self.feromon.size:
+            self.feromon *= (1.0 - self.sicak_sifirlama) / self.feromon.max()
+            self.feromon += self.sicak_sifirlama
+        # Costs of the old topology say nothing about the new one
+        self.sinirlari_sifirla()
+        self.sezgisel_guncelle()
+        self.kapasite_guncelle()
+        self.durma.baslat()
+        self._surum = cg.version
+
+    def calistir(self, kaynak, hedef, sicak=False, iterasyon_sayisi=None):
+        """
+        Main iterative loop for the ACO algorithm. With sicak=True a repeat
+        run on the same endpoints continues from the previous pheromone.
+        """
+        if sicak and self._surum is not None and self._uclar == (kaynak, hedef):
+            self.sicak_hazirla()
+        else:
+            self.hazirla()
+        self._uclar = (kaynak, hedef)
+        sonuc = self.iterasyonlar(kaynak, hedef, iterasyon_sayisi or self.iterasyon_sayisi)
+        self.durma.tamamla()
+        return sonuc
+
 
 def run_aco():
     """
-    Default method: Reads input, executes optimization, and writes results to ../data/.
+    Default method: Reads input, executes optimization, and writes results to ../data/
+    (aco_result.json, plus aco_output.csv / aco_path.csv for the UI).
     """
     # Relative path settings
     input_rel = r"../data/aco_input.csv"
+    result_rel = r"../data/aco_result.json"
     output_rel = r"../data/aco_output.csv"
+    path_rel = r"../data/aco_path.csv"
 
     params = csvden_parametreleri_oku(input_rel)
 
@@ -184,40 +445,55 @@ def run_aco():
 
         # NetworkManager initialization
         network = NetworkManager()
-
-        aco = KarincaKolonisiOptimizasyonu(
-            network, agirliklar,
-            int(params["karinca_sayisi"]), int(params["iterasyon"]),
-            float(params["alfa"]), float(params["beta"]), float(params["buharlasma"]), float(params["q_degeri"])
-        )
-
-        start_time = time.time()
-        yol, fitness = aco.calistir(KAYNAK, HEDEF)
-        sure = time.time() - start_time
-
-        metrikler = network.calculate_fitness(yol, agirliklar) if yol else \
-            {"fitness": float('inf'), "total_delay": 0, "total_reliability": 0, "resource_cost": 0}
-
-        # Save results to output file
+        bw_talep = float(params.get("bw_talep", 0))
+
+        # Same request on the same topology: reuse the stored route
+        onbellek, anahtar, kayit = None, None, None
+        if int(float(params.get("rota_onbellegi", 1))) and not params.get("iz_dosyasi"):
+            onbellek = RouteCache.for_folder(network.data_folder)
+            anahtar = route_key(network, "aco.py", KAYNAK, HEDEF, agirliklar, bw_talep,
+                                {k: v for k, v in params.items() if k != "rota_onbellegi"})
+            kayit = onbellek.get(anahtar)
+        isabet = kayit is not None
+
+        if isabet:
+            print("Route cache hit.")
+        else:
+            # A run without a seed still records one, so it can be replayed
+            tohum = tohum_oku(params)
+            tohum = yeni_tohum() if tohum is None else tohum
+
+            aco = KarincaKolonisiOptimizasyonu(
+                network, agirliklar,
+                int(params["karinca_sayisi"]), int(params["iterasyon"]),
+                float(params["alfa"]), float(params["beta"]), float(params["buharlasma"]), float(params["q_degeri"]),
+                bw_talep=bw_talep,
+                tohum=tohum, durma=DurmaKosulu.parametrelerden(params),
+                aday_sayisi=int(float(params.get("aday_sayisi", 0))),
+                maks_min=bool(int(float(params.get("maks_min", 0))))
+            )
+            # Optional per-iteration trace, relative to the data folder
+            if params.get("iz_dosyasi"):
+                current_dir = os.path.dirname(os.path.abspath(__file__))
+                aco.iz = IterasyonIzi(os.path.join(current_dir, "../data", params["iz_dosyasi"]))
+
+            start_time = time.time()
+            yol, _ = aco.calistir(KAYNAK, HEDEF)
+            sure = time.time() - start_time
+            if aco.iz:
+                aco.iz.kapat()
+            kayit = build_result(network, "aco", KAYNAK, HEDEF, agirliklar, yol, sure, bw_talep,
+                                 params, tohum, aco.durma.ozet())
+            if onbellek is not None:
+                onbellek.put(anahtar, network.topology_hash, kayit)
+        kayit["onbellek"] = isabet
+
+        # One JSON document, plus the CSV pair the UI reads
         current_dir = os.path.dirname(os.path.abspath(__file__))
-        out_path = os.path.abspath(os.path.join(current_dir, output_rel))
-
-        with open(out_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Alan", "Deger"])
-            writer.writerow(["Kaynak", KAYNAK])
-            writer.writerow(["Hedef", HEDEF])
-            writer.writerow(["Yol", " → ".join(map(str, yol)) if yol else "BULUNAMADI"])
-            writer.writerow(["Fitness", round(metrikler["fitness"], 6)])
-            writer.writerow(["Gecikme (ms)", round(metrikler.get("total_delay", 0), 4)])
-            writer.writerow(["Guvenilirlik (%)", round(metrikler.get("total_reliability", 0) * 100, 2)])
-            writer.writerow(["Sure (sn)", round(sure, 4)])
-
-        # Automatically export the minimalist path CSV if a path was found
-        if yol:
-            export_path_csv(yol)
-
-        return {"yol": yol, "fitness": fitness, "sure": sure}
+        write_result(os.path.join(current_dir, result_rel), kayit)
+        write_legacy_csv(kayit, os.path.join(current_dir, output_rel),
+                         os.path.join(current_dir, path_rel))
+        return kayit
     except Exception as e:
         print(f"Critical Error: {e}")
         return None
@@ -227,6 +503,6 @@ if __name__ == "__main__":
     print("Initializing Ant Colony Optimization...")
     res = run_aco()
     if res and res["yol"]:
-        print(f"Success. Best Fitness: {res['fitness']:.4f}")
+        print(f"Success. Best Fitness: {res['fitness']:.4f} | Tohum: {res['tohum']}")
     else:
         print("Search completed without finding a valid path.")
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+Routes every demand in demand.csv in one run.
+
+Demands are spread over a ProcessPoolExecutor. Each worker receives the
+compiled graph once through the pool initializer; tasks only carry the
+demand and the solver parameters.
+
+Results go to one NDJSON file, one solve() result per line (see
+result_writer); an --output ending in .csv writes the flat table instead.
+
+    python batch_routing.py --algo aco --workers 8
+"""
+import argparse
+import csv
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from aco import csvden_parametreleri_oku
+from network_manager import NetworkManager
+from result_writer import PATH_SEPARATOR, atomic_write, write_results
+from solver import solve
+
+# Per-worker manager, set by _worker_init
+_network = None
+
+
+def _worker_init(compiled, weights):
+    global _network
+    _network = NetworkManager.from_compiled(compiled, weights=weights)
+
+
+def _worker_solve(gorev, kapasite=False):
+    sira, talep, algo, agirliklar, params = gorev
+    bw_talep = talep["bw_demand"] if kapasite else 0
+    try:
+        sonuc = solve(_network, algo, talep["src"], talep["dst"], agirliklar, params, bw_talep)
+        sonuc["hata"] = ""
+    except Exception as e:
+        # One bad demand must not abort the whole batch
+        sonuc = {"algo": algo, "kaynak": talep["src"], "hedef": talep["dst"], "yol": None,
+                 "fitness": float('inf'), "total_delay": float('inf'),
+                 "total_reliability": 0.0, "resource_cost": float('inf'),
+                 "sure": 0.0, "optimum_fitness": float('inf'),
+                 "optimallik_farki": float('inf'), "hata": str(e)}
+    sonuc.update(sira=sira, bw_demand=talep["bw_demand"])
+    return sonuc
+
+
+def route_demands(network, algo="aco", agirliklar=None, params=None, workers=None, demands=None,
+                  kapasite=False):
+    """
+    Solves every demand (defaults to network.demands) and returns one result
+    dict per demand, in input order.
+
+    With `kapasite` each demand is routed over links that still have
+    `bw_demand` residual bandwidth and then reserves it. Reservations depend
+    on the order of the demands, so this mode runs sequentially.
+    """
+    agirliklar = tuple(agirliklar or network.weights)
+    demands = network.demands if demands is None else demands
+    gorevler = [(i, talep, algo, agirliklar, params) for i, talep in enumerate(demands)]
+    if not gorevler:
+        return []
+
+    if kapasite:
+        global _network
+        _network = network
+        sonuclar = []
+        for gorev in gorevler:
+            sonuc = _worker_solve(gorev, kapasite=True)
+            if sonuc["yol"]:
+                network.reserve_path(sonuc["yol"], sonuc["bw_demand"])
+            sonuclar.append(sonuc)
+        return sonuclar
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(gorevler) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init,
+                             initargs=(network.compiled, network.weights)) as executor:
+        return list(executor.map(_worker_solve, gorevler, chunksize=chunksize))
+
+
+def write_batch_csv(sonuclar, dosya_adi=r"../data/batch_output.csv"):
+    """Writes all demand results into one consolidated CSV."""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    abs_path = os.path.abspath(os.path.join(current_dir, dosya_adi))
+
+    with io.StringIO() as f:
+        writer = csv.writer(f)
+        writer.writerow(["sira", "kaynak", "hedef", "bw_demand", "algo", "yol",
+                         "fitness", "gecikme_ms", "guvenilirlik", "kaynak_maliyeti", "sure_sn",
+                         "optimum_fitness", "optimallik_farki", "hata"])
+        for s in sonuclar:
+            writer.writerow([
+                s["sira"], s["kaynak"], s["hedef"], s["bw_demand"], s["algo"],
+                PATH_SEPARATOR.join(map(str, s["yol"])) if s["yol"] else "BULUNAMADI",
+                round(s["fitness"], 6), round(s["total_delay"], 4),
+                round(s["total_reliability"], 6), round(s["resource_cost"], 6),
+                round(s["sure"], 4), round(s["optimum_fitness"], 6),
+                round(s["optimallik_farki"], 4), s["hata"]
+            ])
+        return atomic_write(abs_path, f.getvalue())
+
+
+def write_batch_results(sonuclar, dosya_adi=r"../data/batch_output.jsonl"):
+    """Writes all demand results as NDJSON, or as CSV for a .csv file name."""
+    if dosya_adi.lower().endswith(".csv"):
+        return write_batch_csv(sonuclar, dosya_adi)
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return write_results(os.path.join(current_dir, dosya_adi), sonuclar)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Route every demand in demand.csv")
+    parser.add_argument("--algo", choices=["aco", "ga"], default="aco")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=r"../data/batch_output.jsonl",
+                        help="NDJSON result file (.csv: flat table)")
+    parser.add_argument("--capacity", action="store_true",
+                        help="Enforce bw_demand and reserve residual capacity (sequential)")
+    args = parser.parse_args()
+
+    # Weights and solver parameters come from the usual input CSV
+    input_rel = r"../data/aco_input.csv" if args.algo == "aco" else r"../data/genetic_input.csv"
+    params = csvden_parametreleri_oku(input_rel)
+    agirliklar = (float(params.get("agirlik_delay", 0.33)),
+                  float(params.get("agirlik_reliability", 0.33)),
+                  float(params.get("agirlik_cost", 0.34)))
+
+    network = NetworkManager()
+    start_time = time.time()
+    sonuclar = route_demands(network, args.algo, agirliklar, params, args.workers,
+                             kapasite=args.capacity)
+    sure = time.time() - start_time
+
+    out_path = write_batch_results(sonuclar, args.output)
+    bulunan = sum(1 for s in sonuclar if s["yol"])
+    print(f"Routed {bulunan}/{len(sonuclar)} demands in {sure:.2f}s -> {out_path}")
+
+
+if __name__ == "__main__":
+    main()
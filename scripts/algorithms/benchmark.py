@@ -0,0 +1,222 @@
+"""
+Scaling benchmark over synthetic QoS topologies.
+
+Generates random connected topologies in the nodes.csv / edges.csv /
+demand.csv schema (same attribute ranges as the Flutter generator). Then it
+runs ACO, GA and the exact Dijkstra baseline with fixed seeds on the same
+source/target pairs. Results go to one JSON file.
+
+Each record has the wall time, the peak traced memory, the fitness
+evaluations per second, and the gap to the exact optimum. GA evaluations
+count fitness cache misses only; the hits are reported next to them.
+
+    python benchmark.py                              # 250, 1k, 10k, 50k nodes
+    python benchmark.py --boyutlar 250 1000 --ciftler 5 --cikti ../data/benchmark.json
+
+This is a measurement script, not a test: it never fails on slow numbers.
+"""
+import argparse
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from aco import KarincaKolonisiOptimizasyonu
+from genetics import GenetikAlgoritma
+from network_manager import NetworkManager
+from result_writer import write_result
+from stopping import DurmaKosulu
+
+VARSAYILAN_BOYUTLAR = (250, 1000, 10000, 50000)
+
+
+def topoloji_uret(klasor, dugum_sayisi, ortalama_derece=8.0, talep_sayisi=20, tohum=0):
+    """
+    Writes a connected random topology into `klasor`: a random spanning tree
+    plus uniformly random extra links up to `ortalama_derece`.
+    """
+    rng = np.random.default_rng(tohum)
+    os.makedirs(klasor, exist_ok=True)
+    n = int(dugum_sayisi)
+
+    # Spanning tree: node i attaches to a random earlier node
+    agac_u = np.arange(1, n)
+    agac_v = (rng.random(n - 1) * agac_u).astype(np.int64)
+    ek = max(0, int(n * ortalama_derece / 2) - (n - 1))
+    ek_u = rng.integers(0, n, ek)
+    ek_v = rng.integers(0, n, ek)
+    u = np.concatenate([agac_u, ek_u])
+    v = np.concatenate([agac_v, ek_v])
+    lo, hi = np.minimum(u, v), np.maximum(u, v)
+    anahtar = np.unique(lo[lo != hi] * n + hi[lo != hi])
+    src, dst = anahtar // n, anahtar % n
+    m = len(src)
+
+    def ondalik(dizi, basamak):
+        # The Flutter writer uses comma decimals
+        return np.char.replace(np.char.mod(f"%.{basamak}f", dizi), ".", ",")
+
+    dugumler = np.column_stack([np.arange(n).astype(str),
+                                ondalik(0.5 + rng.random(n) * 1.5, 2),
+                                ondalik(0.95 + rng.random(n) * 0.049, 3)])
+    kenarlar = np.column_stack([src.astype(str), dst.astype(str),
+                                np.round(100 + rng.random(m) * 900).astype(np.int64).astype(str),
+                                np.round(3 + rng.random(m) * 12).astype(np.int64).astype(str),
+                                ondalik(0.95 + rng.random(m) * 0.049, 3)])
+    talep_src = rng.integers(0, n, talep_sayisi)
+    talep_dst = (talep_src + 1 + rng.integers(0, n - 1, talep_sayisi)) % n
+    talepler = np.column_stack([talep_src.astype(str), talep_dst.astype(str),
+                                rng.choice([100, 200, 500, 900], talep_sayisi).astype(str)])
+
+    for ad, baslik, tablo in (("nodes.csv", "node_id;s_ms;r_node", dugumler),
+                              ("edges.csv", "src;dst;capacity_mbps;delay_ms;r_link", kenarlar),
+                              ("demand.csv", "src;dst;demand_mbps", talepler)):
+        with open(os.path.join(klasor, ad), "w", encoding="utf-8") as f:
+            f.write(baslik + "\n")
+            f.write("\n".join(";".join(satir) for satir in tablo) + "\n")
+    return n, m
+
+
+def _olc(fonksiyon, bellek=True):
+    """Runs fonksiyon() and returns (result, seconds, peak traced MB or None)."""
+    if bellek:
+        tracemalloc.start()
+    baslangic = time.perf_counter()
+    try:
+        sonuc = fonksiyon()
+    finally:
+        sure = time.perf_counter() - baslangic
+        tepe = tracemalloc.get_traced_memory()[1] / 2 ** 20 if bellek else None
+        if bellek:
+            tracemalloc.stop()
+    return sonuc, sure, tepe
+
+
+def _calistir(network, algo, kaynak, hedef, agirliklar, ayar, tohum):
+    """One solve; returns (path, fitness, evaluations, fitness cache hits, stop reason)."""
+    durma = DurmaKosulu(sure_limiti=ayar["sure_limiti"])
+    isabet = None
+    if algo == "exact":
+        sonuc = network.solve_exact(kaynak, hedef, agirliklar)
+        return sonuc["path"], sonuc["fitness"], None, None, None
+    if algo == "aco":
+        optimizer = KarincaKolonisiOptimizasyonu(
+            network, agirliklar, ayar["karinca_sayisi"], ayar["iterasyon"],
+            tohum=tohum, durma=durma, aday_sayisi=ayar["aday_sayisi"],
+            maks_min=ayar["maks_min"])
+        yol, fitness = optimizer.calistir(kaynak, hedef)
+        degerlendirme = optimizer.karinca_sayisi * durma.iterasyon
+    else:
+        optimizer = GenetikAlgoritma(
+            network, agirliklar, ayar["pop_size"], ayar["nesil_sayisi"],
+            tohum=tohum, durma=durma, memetik=ayar["memetik"])
+        yol, fitness = optimizer.calistir(kaynak, hedef)
+        # Cache hits cost a dict lookup, not an evaluation
+        degerlendirme = optimizer.onbellek.iskalama
+        isabet = optimizer.onbellek.isabet
+    return yol, fitness, degerlendirme, isabet, durma.durma_nedeni
+
+
+def benchmark(boyutlar=VARSAYILAN_BOYUTLAR, algoritmalar=("exact", "aco", "ga"), ciftler=3,
+              klasor=None, tohum=0, agirliklar=(0.33, 0.33, 0.34), ayar=None, bellek=True,
+              ilerleme=None):
+    """Runs every algorithm on every size and returns the list of result records."""
+    ayar = {"karinca_sayisi": 30, "iterasyon": 50, "aday_sayisi": 0, "maks_min": False,
+            "pop_size": 100, "nesil_sayisi": 200, "memetik": False, "sure_limiti": 120.0,
+            **(ayar or {})}
+    klasor = klasor or tempfile.mkdtemp(prefix="qos_benchmark_")
+    kayitlar = []
+
+    for boyut in boyutlar:
+        alt_klasor = os.path.join(klasor, f"n{boyut}")
+        (n, m), uretim_suresi, _ = _olc(
+            lambda: topoloji_uret(alt_klasor, boyut, tohum=tohum), bellek=False)
+        yukle = lambda: NetworkManager(agirliklar, data_folder=alt_klasor, use_cache=False)
+        network, yukleme_suresi, yukleme_bellek = _olc(yukle, bellek)
+        if bellek:
+            network, yukleme_suresi, _ = _olc(yukle, bellek=False)
+
+        rng = np.random.default_rng(tohum)
+        uclar = [tuple(int(x) for x in rng.choice(network.compiled.node_ids, 2, replace=False))
+                 for _ in range(ciftler)]
+
+        for cift_no, (kaynak, hedef) in enumerate(uclar):
+            optimum = network.solve_exact(kaynak, hedef, agirliklar)["fitness"]
+            for algo in algoritmalar:
+                (yol, fitness, degerlendirme, isabet, neden), sure, tepe = _olc(
+                    lambda: _calistir(network, algo, kaynak, hedef, agirliklar, ayar,
+                                      tohum + cift_no), bellek and cift_no == 0)
+                # Wall time is measured again without tracemalloc overhead
+                if tepe is not None:
+                    _, sure, _ = _olc(
+                        lambda: _calistir(network, algo, kaynak, hedef, agirliklar, ayar,
+                                          tohum + cift_no), bellek=False)
+                kayit = {
+                    "dugum": n, "kenar": m, "algo": algo, "kaynak": kaynak, "hedef": hedef,
+                    "uretim_suresi": uretim_suresi, "yukleme_suresi": yukleme_suresi,
+                    "yukleme_tepe_bellek_mb": yukleme_bellek,
+                    "sure": sure, "tepe_bellek_mb": tepe,
+                    "degerlendirme": degerlendirme,
+                    "onbellek_isabet": isabet,
+                    "degerlendirme_hizi": degerlendirme / sure if degerlendirme and sure > 0 else None,
+                    "fitness": fitness if np.isfinite(fitness) else None,
+                    "optimum": optimum if np.isfinite(optimum) else None,
+                    "optimallik_farki": network.optimality_gap(fitness, optimum)
+                    if yol and np.isfinite(optimum) else None,
+                    "yol_uzunlugu": len(yol) if yol else None,
+                    "durma_nedeni": neden,
+                }
+                kayitlar.append(kayit)
+                if ilerleme:
+                    ilerleme(kayit)
+    return kayitlar
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark for ACO, GA and exact")
+    parser.add_argument("--boyutlar", type=int, nargs="+", default=list(VARSAYILAN_BOYUTLAR))
+    parser.add_argument("--algoritmalar", nargs="+", default=["exact", "aco", "ga"],
+                        choices=["exact", "aco", "ga"])
+    parser.add_argument("--ciftler", type=int, default=3, help="Source/target pairs per size")
+    parser.add_argument("--tohum", type=int, default=0)
+    parser.add_argument("--klasor", default=None, help="Keep generated topologies here")
+    parser.add_argument("--cikti", default=r"../data/benchmark.json")
+    parser.add_argument("--sure-limiti", type=float, default=120.0,
+                        help="Wall-clock budget per ACO/GA run (s)")
+    parser.add_argument("--bellek-yok", action="store_true", help="Skip tracemalloc runs")
+    parser.add_argument("--aday-sayisi", type=int, default=0,
+                        help="ACO candidate list size (0: full neighborhood)")
+    parser.add_argument("--maks-min", action="store_true", help="ACO with MAX-MIN bounds")
+    parser.add_argument("--memetik", action="store_true", help="GA with local search")
+    args = parser.parse_args()
+
+    def yaz(k):
+        fark = "-" if k["optimallik_farki"] is None else f"{k['optimallik_farki']:.2f}%"
+        print(f"n={k['dugum']:>6} {k['algo']:>5} {k['kaynak']}->{k['hedef']}: "
+              f"{k['sure']:.3f}s fark={fark} durma={k['durma_nedeni']}", flush=True)
+
+    kayitlar = benchmark(args.boyutlar, args.algoritmalar, args.ciftler, args.klasor,
+                         args.tohum, ayar={"sure_limiti": args.sure_limiti,
+                                           "aday_sayisi": args.aday_sayisi,
+                                           "maks_min": args.maks_min,
+                                           "memetik": args.memetik},
+                         bellek=not args.bellek_yok, ilerleme=yaz)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    cikti = os.path.abspath(os.path.join(current_dir, args.cikti))
+    rapor = {
+        "ortam": {"python": sys.version.split()[0], "numpy": np.__version__,
+                  "platform": platform.platform(), "cpu": os.cpu_count()},
+        "tohum": args.tohum,
+        "sonuclar": kayitlar,
+    }
+    write_result(cikti, rapor)
+    print(f"Results -> {cikti}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,738 @@
+import heapq
+
+import numpy as np
+
+
+def _reliability_cost(reliability):
+    """-log(r), or 100 for a zero reliability."""
+    positive = reliability > 0
+    return np.where(positive, -np.log(np.where(positive, reliability, 1.0)), 100.0)
+
+
+def _resource_cost(bandwidth):
+    """1000 / bw, or 100 for a zero bandwidth."""
+    positive = bandwidth > 0
+    return np.where(positive, 1000.0 / np.where(positive, bandwidth, 1.0), 100.0)
+
+
+class CompiledGraph:
+    """
+    Compact CSR form of the QoS topology.
+
+    Nodes are mapped to dense indices (sorted by id). Every undirected edge
+    has one slot in the per-edge arrays; the CSR adjacency stores both
+    directions and points back to that slot through `slot_edge`.
+    """
+
+    def __init__(self, node_ids, node_processing_delay, node_reliability,
+                 edge_u, edge_v, edge_bandwidth, edge_delay, edge_reliability):
+        self.node_ids = np.asarray(node_ids, dtype=np.int64)
+        self.node_count = len(self.node_ids)
+
+        # Raw attributes
+        self.node_processing_delay = np.asarray(node_processing_delay, dtype=np.float64)
+        self.node_reliability = np.asarray(node_reliability, dtype=np.float64)
+        self.edge_u = np.asarray(edge_u, dtype=np.int64)
+        self.edge_v = np.asarray(edge_v, dtype=np.int64)
+        self.edge_bandwidth = np.asarray(edge_bandwidth, dtype=np.float64)
+        self.edge_delay = np.asarray(edge_delay, dtype=np.float64)
+        self.edge_reliability = np.asarray(edge_reliability, dtype=np.float64)
+        self.edge_count = len(self.edge_u)
+
+        # Capacity left on every edge after reserve() calls
+        self.residual_bandwidth = self.edge_bandwidth.copy()
+
+        # Bumped by every in-place update; see changes_since()
+        self.version = 0
+        self._changes = []
+
+        self._derive_costs()
+        self._build_csr()
+
+    @classmethod
+    def from_networkx(cls, G):
+        node_ids = np.array(sorted(G.nodes()), dtype=np.int64)
+        proc_delay = np.empty(len(node_ids))
+        node_rel = np.empty(len(node_ids))
+        for i, node_id in enumerate(node_ids):
+            node_data = G.nodes[int(node_id)]
+            proc_delay[i] = node_data.get('processing_delay', 0)
+            node_rel[i] = node_data.get('reliability', 0.99)
+
+        edge_count = G.number_of_edges()
+        edge_u = np.empty(edge_count, dtype=np.int64)
+        edge_v = np.empty(edge_count, dtype=np.int64)
+        bw = np.empty(edge_count)
+        delay = np.empty(edge_count)
+        rel = np.empty(edge_count)
+        for i, (u, v, edge_data) in enumerate(G.edges(data=True)):
+            edge_u[i] = u
+            edge_v[i] = v
+            bw[i] = edge_data.get('bandwidth', 1)
+            delay[i] = edge_data.get('link_delay', 0)
+            rel[i] = edge_data.get('reliability', 0.99)
+
+        # Store edge endpoints as dense indices
+        edge_u = np.searchsorted(node_ids, edge_u)
+        edge_v = np.searchsorted(node_ids, edge_v)
+
+        return cls(node_ids, proc_delay, node_rel, edge_u, edge_v, bw, delay, rel)
+
+    def to_networkx(self):
+        """Rebuilds the networkx graph with the attribute names NetworkManager uses."""
+        import networkx as nx
+
+        G = nx.Graph()
+        for node_id, proc_delay, rel in zip(self.node_ids.tolist(),
+                                            self.node_processing_delay.tolist(),
+                                            self.node_reliability.tolist()):
+            G.add_node(node_id, processing_delay=proc_delay, reliability=rel)
+
+        node_ids = self.node_ids
+        for u, v, bw, delay, rel in zip(node_ids[self.edge_u].tolist(),
+                                        node_ids[self.edge_v].tolist(),
+                                        self.edge_bandwidth.tolist(),
+                                        self.edge_delay.tolist(),
+                                        self.edge_reliability.tolist()):
+            G.add_edge(u, v, bandwidth=bw, link_delay=delay, reliability=rel)
+        return G
+
+    def _derive_costs(self):
+        """Precomputes the additive per-hop costs used by calculate_fitness."""
+        self.node_rel_cost = _reliability_cost(self.node_reliability)
+        self.edge_rel_cost = _reliability_cost(self.edge_reliability)
+        self.edge_res_cost = _resource_cost(self.edge_bandwidth)
+
+    def _build_csr(self):
+        n = self.node_count
+        edge_ids = np.arange(self.edge_count, dtype=np.int64)
+
+        src = np.concatenate([self.edge_u, self.edge_v])
+        dst = np.concatenate([self.edge_v, self.edge_u])
+        slot_edge = np.concatenate([edge_ids, edge_ids])
+
+        order = np.lexsort((dst, src))
+        src, dst, slot_edge = src[order], dst[order], slot_edge[order]
+
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+        self.indices = dst
+        self.slot_edge = slot_edge
+        # Sorted (src, dst) keys give an O(log E) vectorized edge lookup
+        self.slot_keys = src * max(n, 1) + dst
+        self._padded = None
+        self._eta_cache = {}
+        self._cost_cache = {}
+
+    def heuristic(self, weights):
+        """
+        ACO desirability (eta) of every CSR slot u -> v for one weight vector.
+        Computed once per weights and cached.
+        """
+        key = tuple(float(w) for w in weights)
+        if key not in self._eta_cache:
+            w_d, w_r, w_res = key
+            edge = self.slot_edge
+            v = self.indices
+
+            local_delay = self.edge_delay[edge] + self.node_processing_delay[v]
+
+            rel_score = self.edge_reliability[edge] * self.node_reliability[v]
+            local_rel_cost = np.full(len(v), 100.0)
+            positive = rel_score > 0
+            local_rel_cost[positive] = -np.log(rel_score[positive])
+
+            bw = self.edge_bandwidth[edge]
+            local_res_cost = np.full(len(v), 100.0)
+            positive = bw > 0
+            local_res_cost[positive] = 1000.0 / bw[positive]
+
+            total_local_cost = (w_d * local_delay) + (w_r * local_rel_cost) + (w_res * local_res_cost)
+            eta = np.full(len(v), 0.0001)
+            positive = total_local_cost > 0
+            eta[positive] = 1.0 / total_local_cost[positive]
+            self._eta_cache[key] = eta
+        return self._eta_cache[key]
+
+    def feasible_edges(self, bw_demand=0):
+        """Mask of edges whose residual bandwidth can carry `bw_demand`."""
+        return self.residual_bandwidth >= bw_demand
+
+    def reserve(self, path, bw_demand):
+        """Subtracts `bw_demand` from the residual bandwidth of every hop of `path`."""
+        _, edges = self.path_edges([path])
+        if (edges < 0).any():
+            raise ValueError(f"Path uses a missing edge: {path}")
+        np.subtract.at(self.residual_bandwidth, edges, bw_demand)
+
+    def reset_residual(self):
+        self.residual_bandwidth = self.edge_bandwidth.copy()
+
+    def _edge_id(self, u, v):
+        slot = self.find_slots([u], [v])[0]
+        if slot < 0:
+            raise KeyError(f"No link between node indices {u} and {v}")
+        return int(self.slot_edge[slot])
+
+    def _record(self, pairs=(), nodes=(), remap=None):
+        self.version += 1
+        self._changes.append((self.version, list(pairs), list(nodes), remap))
+        # eta and the weighted hop costs depend on every edge and node cost
+        self._eta_cache = {}
+        self._cost_cache = {}
+
+    def update_edge(self, u, v, bandwidth=None, delay=None, reliability=None):
+        """
+        Patches one link's attributes in place (dense indices). Reservations
+        are kept: the residual bandwidth moves by the same amount as the
+        capacity. Returns the edge id.
+        """
+        edge = self._edge_id(u, v)
+        if bandwidth is not None:
+            self.residual_bandwidth[edge] += bandwidth - self.edge_bandwidth[edge]
+            self.edge_bandwidth[edge] = bandwidth
+            self.edge_res_cost[edge] = _resource_cost(self.edge_bandwidth[edge])
+        if delay is not None:
+            self.edge_delay[edge] = delay
+        if reliability is not None:
+            self.edge_reliability[edge] = reliability
+            self.edge_rel_cost[edge] = _reliability_cost(self.edge_reliability[edge])
+        self._record(pairs=[(u, v)])
+        return edge
+
+    def update_node(self, node, processing_delay=None, reliability=None):
+        """Patches one node's attributes in place (dense index)."""
+        if processing_delay is not None:
+            self.node_processing_delay[node] = processing_delay
+        if reliability is not None:
+            self.node_reliability[node] = reliability
+            self.node_rel_cost[node] = _reliability_cost(self.node_reliability[node])
+        self._record(nodes=[node])
+
+    def remove_edge(self, u, v):
+        """
+        Drops one link (dense indices) and rebuilds the CSR arrays. Edge ids
+        above the removed one shift down by one; the old -> new mapping is
+        reported by changes_since().
+        """
+        edge = self._edge_id(u, v)
+        keep = np.arange(self.edge_count) != edge
+        remap = np.cumsum(keep) - 1
+        remap[edge] = -1
+        for name in ('edge_u', 'edge_v', 'edge_bandwidth', 'edge_delay', 'edge_reliability',
+                     'edge_rel_cost', 'edge_res_cost', 'residual_bandwidth'):
+            setattr(self, name, getattr(self, name)[keep])
+        self.edge_count -= 1
+        self._build_csr()
+        self._record(pairs=[(u, v)], remap=remap)
+
+    def changes_since(self, version):
+        """
+        Everything changed after `version`: (pairs, nodes, remap). `pairs` are
+        the (u, v) index pairs of updated or removed links, `nodes` the
+        updated nodes, and `remap` maps edge ids of that version to current
+        ones (-1 for removed edges), or None if no edge was removed.
+        """
+        pairs, nodes, remap = set(), set(), None
+        for changed_in, changed_pairs, changed_nodes, step in self._changes:
+            if changed_in <= version:
+                continue
+            pairs.update((min(a, b), max(a, b)) for a, b in changed_pairs)
+            nodes.update(changed_nodes)
+            if step is not None:
+                remap = step if remap is None else np.where(remap >= 0, step[remap], -1)
+        return sorted(pairs), sorted(nodes), remap
+
+    def neighbor_slots(self, nodes):
+        """All CSR slots leaving `nodes` (dense indices), concatenated."""
+        starts = self.indptr[nodes]
+        degree = self.indptr[np.asarray(nodes) + 1] - starts
+        ends = np.cumsum(degree)
+        return np.repeat(starts - (ends - degree), degree) + np.arange(int(ends[-1]) if len(ends) else 0)
+
+    def hop_tree(self, root, bw_demand=0):
+        """
+        Frontier BFS toward `root` (dense index). Returns (dist, next_hop):
+        hop count to root (inf if unreachable) and the neighbor one hop closer
+        to root (-1 for root and unreachable nodes).
+        """
+        feasible = self.feasible_edges(bw_demand) if bw_demand > 0 else None
+        dist = np.full(self.node_count, np.inf)
+        next_hop = np.full(self.node_count, -1, dtype=np.int64)
+        dist[root] = 0
+        frontier = np.array([root])
+        depth = 0
+        while frontier.size:
+            depth += 1
+            slots = self.neighbor_slots(frontier)
+            parents = np.repeat(frontier, self.indptr[frontier + 1] - self.indptr[frontier])
+            if feasible is not None:
+                keep = feasible[self.slot_edge[slots]]
+                slots, parents = slots[keep], parents[keep]
+            reached, first = np.unique(self.indices[slots], return_index=True)
+            new = np.isinf(dist[reached])
+            frontier = reached[new]
+            dist[frontier] = depth
+            next_hop[frontier] = parents[first[new]]
+        return dist, next_hop
+
+    def hop_distances(self, root, bw_demand=0):
+        """Hop count from every node to `root` (dense index); inf if unreachable."""
+        return self.hop_tree(root, bw_demand)[0]
+
+    def hop_costs(self, weights):
+        """
+        Weighted per-edge and per-node cost of the calculate_fitness objective.
+        Computed once per weights and cached; callers must not modify them.
+        """
+        key = tuple(float(w) for w in weights)
+        if key not in self._cost_cache:
+            w_delay, w_rel, w_res = key
+            edge_cost = (w_delay * self.edge_delay) + (w_rel * self.edge_rel_cost) + \
+                        (w_res * self.edge_res_cost)
+            node_cost = (w_delay * self.node_processing_delay) + (w_rel * self.node_rel_cost)
+            self._cost_cache[key] = (edge_cost, node_cost)
+        return self._cost_cache[key]
+
+    def shortest_path_tree(self, root, weights, bw_demand=0, stop_at=None):
+        """
+        Heap-based Dijkstra toward `root` (dense index) under the weighted
+        fitness cost. A hop u -> v costs the edge plus node v, except when v is
+        `root`, so dist[u] is exactly the fitness of the path u ... root.
+
+        Returns (dist, next_hop); next_hop[u] is the neighbor of u on its
+        optimal path to root (-1 for root and unreachable nodes). With
+        `stop_at` the search ends as soon as that node is settled.
+        """
+        n = self.node_count
+        edge_cost, node_cost = self.hop_costs(weights)
+        feasible = self.feasible_edges(bw_demand) if bw_demand > 0 else None
+
+        # Plain lists are much faster than NumPy scalars inside the heap loop
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        slot_cost = edge_cost[self.slot_edge]
+        if feasible is not None:
+            slot_cost = np.where(feasible[self.slot_edge], slot_cost, np.inf)
+        slot_cost = slot_cost.tolist()
+        node_cost = node_cost.tolist()
+
+        dist = [float('inf')] * n
+        next_hop = [-1] * n
+        done = [False] * n
+        dist[root] = 0.0
+        heap = [(0.0, root)]
+
+        while heap:
+            d, v = heapq.heappop(heap)
+            if done[v]:
+                continue
+            done[v] = True
+            if v == stop_at:
+                break
+            through_v = d + (node_cost[v] if v != root else 0.0)
+            for slot in range(indptr[v], indptr[v + 1]):
+                u = indices[slot]
+                cand = through_v + slot_cost[slot]
+                if cand < dist[u]:
+                    dist[u] = cand
+                    next_hop[u] = v
+                    heapq.heappush(heap, (cand, u))
+
+        return np.array(dist), np.array(next_hop, dtype=np.int64)
+
+    def follow_tree(self, next_hop, start):
+        """Walks next_hop pointers from `start`; returns node ids or None if unreachable."""
+        path = [start]
+        while next_hop[path[-1]] >= 0:
+            path.append(int(next_hop[path[-1]]))
+            if len(path) > self.node_count:
+                return None
+        return self.node_ids[path].tolist()
+
+    def k_shortest_paths(self, source, target, k=5, bw_demand=0):
+        """
+        Yen's algorithm on hop count between dense indices: up to `k` loopless
+        paths in non-decreasing length, as node id lists.
+        """
+        if source == target:
+            return []
+        feasible = self.feasible_edges(bw_demand)[self.slot_edge].tolist()
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        slot_edge = self.slot_edge.tolist()
+
+        def bfs(start, blocked_nodes, blocked_edges):
+            # Bidirectional BFS from start and target over plain lists
+            parents = ({start: -1}, {target: -1})
+            frontiers = ([start], [target])
+            while frontiers[0] and frontiers[1]:
+                side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+                mine, other = parents[side], parents[1 - side]
+                following = []
+                for u in frontiers[side]:
+                    for slot in range(indptr[u], indptr[u + 1]):
+                        v = indices[slot]
+                        if v in mine or v in blocked_nodes or not feasible[slot] \
+                                or slot_edge[slot] in blocked_edges:
+                            continue
+                        mine[v] = u
+                        if v in other:
+                            forward, backward = [v], [v]
+                            while parents[0][forward[-1]] >= 0:
+                                forward.append(parents[0][forward[-1]])
+                            while parents[1][backward[-1]] >= 0:
+                                backward.append(parents[1][backward[-1]])
+                            return forward[::-1] + backward[1:]
+                        following.append(v)
+                frontiers = (following, frontiers[1]) if side == 0 else (frontiers[0], following)
+            return None
+
+        first = bfs(source, set(), set())
+        if first is None:
+            return []
+        found = [first]
+        candidates = []
+        seen = {tuple(first)}
+        while len(found) < k:
+            previous = found[-1]
+            for i in range(len(previous) - 1):
+                root = previous[:i + 1]
+                # Edges that would recreate an already found path
+                used = [(path[i], path[i + 1]) for path in found
+                        if len(path) > i + 1 and path[:i + 1] == root]
+                slots = self.find_slots([u for u, _ in used], [v for _, v in used])
+                spur = bfs(root[-1], set(root[:-1]), set(self.slot_edge[slots].tolist()))
+                if spur is None:
+                    continue
+                path = root[:-1] + spur
+                if tuple(path) not in seen:
+                    seen.add(tuple(path))
+                    heapq.heappush(candidates, (len(path), path))
+            if not candidates:
+                break
+            found.append(heapq.heappop(candidates)[1])
+        return [self.node_ids[path].tolist() for path in found]
+
+    def pareto_labels(self, source, target, bw_demand=0, max_labels=50):
+        """
+        Multi-objective label-setting search from `source` to `target` (dense
+        indices) over (delay, -log reliability, resource cost). Returns the
+        non-dominated (costs, path) pairs found at the target. At most
+        `max_labels` labels are kept per node to bound the search.
+        """
+        feasible = self.feasible_edges(bw_demand) if bw_demand > 0 else \
+            np.ones(self.edge_count, dtype=bool)
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        slot_edge = self.slot_edge.tolist()
+        slot_ok = feasible[self.slot_edge].tolist()
+        e_delay = self.edge_delay.tolist()
+        e_rel = self.edge_rel_cost.tolist()
+        e_res = self.edge_res_cost.tolist()
+        n_delay = self.node_processing_delay.tolist()
+        n_rel = self.node_rel_cost.tolist()
+
+        def dominated(costs, labels):
+            return any(o[0] <= costs[0] and o[1] <= costs[1] and o[2] <= costs[2]
+                       for o in labels)
+
+        # Label: (sum of costs, costs, node, parent label id)
+        store = [((0.0, 0.0, 0.0), source, -1)]
+        settled = [[] for _ in range(self.node_count)]
+        heap = [(0.0, 0)]
+        front = []
+
+        while heap:
+            _, label_id = heapq.heappop(heap)
+            costs, v, _ = store[label_id]
+            if dominated(costs, settled[v]) or len(settled[v]) >= max_labels:
+                continue
+            settled[v].append(costs)
+            if v == target:
+                front.append(label_id)
+                continue
+            for slot in range(indptr[v], indptr[v + 1]):
+                if not slot_ok[slot]:
+                    continue
+                u = indices[slot]
+                e = slot_edge[slot]
+                node_delay = n_delay[u] if u != target else 0.0
+                node_rel = n_rel[u] if u != target else 0.0
+                new_costs = (costs[0] + e_delay[e] + node_delay,
+                             costs[1] + e_rel[e] + node_rel,
+                             costs[2] + e_res[e])
+                if dominated(new_costs, settled[u]):
+                    continue
+                store.append((new_costs, u, label_id))
+                heapq.heappush(heap, (sum(new_costs), len(store) - 1))
+
+        results = []
+        for label_id in front:
+            costs = store[label_id][0]
+            path = []
+            while label_id >= 0:
+                _, node, label_id = store[label_id]
+                path.append(node)
+            results.append((costs, self.node_ids[path[::-1]].tolist()))
+        return results
+
+    def padded_adjacency(self):
+        """
+        Dense (node_count, max_degree) neighbor and slot matrices.
+        Padding uses neighbor `node_count` (a sentinel column) and slot -1.
+        """
+        if self._padded is None:
+            n = self.node_count
+            degree = np.diff(self.indptr)
+            width = max(int(degree.max()) if n else 0, 1)
+            neighbors = np.full((n, width), n, dtype=np.int64)
+            slots = np.full((n, width), -1, dtype=np.int64)
+            rows = np.repeat(np.arange(n), degree)
+            cols = np.arange(len(self.indices)) - np.repeat(self.indptr[:-1], degree)
+            neighbors[rows, cols] = self.indices
+            slots[rows, cols] = np.arange(len(self.indices))
+            self._padded = (neighbors, slots)
+        return self._padded
+
+    def to_index(self, node_ids):
+        """Maps node ids to dense indices; unknown ids become -1."""
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        if self.node_count == 0:
+            return np.full(node_ids.shape, -1, dtype=np.int64)
+        idx = np.searchsorted(self.node_ids, node_ids)
+        idx = np.minimum(idx, self.node_count - 1)
+        return np.where(self.node_ids[idx] == node_ids, idx, -1)
+
+    def find_slots(self, src_idx, dst_idx):
+        """Returns the CSR slot for each (src, dst) index pair, or -1 if no edge."""
+        keys = np.asarray(src_idx, dtype=np.int64) * max(self.node_count, 1) + dst_idx
+        if len(self.slot_keys) == 0:
+            return np.full(keys.shape, -1, dtype=np.int64)
+        pos = np.searchsorted(self.slot_keys, keys)
+        pos = np.minimum(pos, len(self.slot_keys) - 1)
+        return np.where(self.slot_keys[pos] == keys, pos, -1)
+
+    def _flatten(self, paths):
+        """Concatenates node id paths into one dense-index array plus offsets."""
+        lengths = np.fromiter((len(p) if p else 0 for p in paths),
+                              dtype=np.int64, count=len(paths))
+        flat = np.fromiter((node for p in paths if p for node in p),
+                           dtype=np.int64, count=int(lengths.sum()))
+        owner = np.repeat(np.arange(len(paths)), lengths)
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        return lengths, self.to_index(flat), owner, starts, ends
+
+    def _hops(self, lengths, flat_idx, owner, ends):
+        """Edge id of every hop (consecutive positions inside one path), -1 if missing."""
+        hop_mask = np.ones(len(flat_idx), dtype=bool)
+        hop_mask[ends[lengths > 0] - 1] = False
+        hop_pos = np.flatnonzero(hop_mask)
+        hop_slots = self.find_slots(flat_idx[hop_pos], flat_idx[hop_pos + 1])
+        hop_edges = np.where(hop_slots >= 0, self.slot_edge[np.maximum(hop_slots, 0)], -1)
+        return owner[hop_pos], hop_edges
+
+    def path_edges(self, paths):
+        """Returns (path position, edge id) for every hop of every path; -1 marks a missing edge."""
+        if self.edge_count == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        lengths, flat_idx, owner, _, ends = self._flatten(paths)
+        return self._hops(lengths, flat_idx, owner, ends)
+
+    def _pair_costs(self, u, v, edge_cost):
+        """Cost of the edge u -> v for index arrays of any shape; inf where there is none."""
+        slots = self.find_slots(u.ravel(), v.ravel()).reshape(u.shape)
+        return np.where(slots >= 0, edge_cost[self.slot_edge[np.maximum(slots, 0)]], np.inf)
+
+    @staticmethod
+    def _remove_loops(path):
+        """Cuts every cycle out of a walk by jumping to the last visit of each node."""
+        last = {node: i for i, node in enumerate(path)}
+        out, i = [], 0
+        while i < len(path):
+            out.append(path[i])
+            i = last[path[i]] + 1
+        return out
+
+    def improve_paths(self, paths, weights=(0.33, 0.33, 0.34), bw_demand=0, window=4, rounds=5):
+        """
+        Local search on a batch of paths (node ids) under the calculate_fitness
+        cost. Loops are cut out first. Then, for up to `rounds` rounds, every
+        path takes its best improving move: a direct edge between two
+        non-adjacent path nodes, or a detour through one node off the path
+        that replaces a segment of 2..`window` hops. All candidate moves of
+        the batch are scored at once over the flattened paths, at
+        O(length * degree) per path and move type. Paths that are too short,
+        or that use unknown nodes or missing edges, come back unchanged.
+        """
+        edge_cost, node_cost = self.hop_costs(weights)
+        if bw_demand > 0:
+            edge_cost = np.where(self.feasible_edges(bw_demand), edge_cost, np.inf)
+        n = self.node_count
+        neighbors, slots = self.padded_adjacency()
+
+        out = [list(p) if p else p for p in paths]
+        active = []
+        for a, path in enumerate(out):
+            if not path:
+                continue
+            out[a] = path = self._remove_loops(path)
+            idx = self.to_index(path)
+            if len(path) >= 3 and (idx >= 0).all():
+                active.append((a, idx))
+
+        for _ in range(rounds):
+            if not active:
+                break
+            count = len(active)
+            flat = np.concatenate([p for _, p in active])
+            lengths = np.array([len(p) for _, p in active])
+            owner = np.repeat(np.arange(count), lengths)
+            starts = np.cumsum(lengths) - lengths
+            local = np.arange(len(flat)) - starts[owner]
+            last = local == lengths[owner] - 1
+
+            # Global prefix sums; differences inside one path are its segment costs
+            hop = np.zeros(len(flat))
+            inner = np.flatnonzero(~last)
+            hop[inner] = self._pair_costs(flat[inner], flat[inner + 1], edge_cost)
+            bad = ~np.isfinite(hop)
+            if bad.any():
+                # Infeasible hops (capacity) make the gains meaningless
+                keep = np.bincount(owner[bad], minlength=count) == 0
+                active = [item for item, k in zip(active, keep) if k]
+                continue
+            E = np.concatenate([[0.0], np.cumsum(hop)])
+            N = np.cumsum(node_cost[flat])
+
+            def interior(i, j):
+                return E[j] - E[i] + N[j - 1] - N[i]
+
+            # Global position of node x on path `o`, -1 if it is not on it
+            keys = owner * (n + 1) + flat
+            order = np.argsort(keys)
+            sorted_keys = keys[order]
+
+            def position(o, x):
+                k = o * (n + 1) + x
+                at = np.minimum(np.searchsorted(sorted_keys, k), len(sorted_keys) - 1)
+                return np.where(sorted_keys[at] == k, order[at], -1)
+
+            nb = neighbors[flat]
+            first = np.where(slots[flat] >= 0,
+                             edge_cost[self.slot_edge[np.maximum(slots[flat], 0)]], np.inf)
+            t = np.arange(len(flat))[:, None]
+            o = owner[:, None]
+
+            # Direct edges from position t to a later position j > t + 1
+            j = position(o, np.where(nb < n, nb, 0))
+            valid = (j >= t + 2) & (nb < n)
+            j = np.where(valid, j, t)
+            gain = np.where(valid, interior(np.broadcast_to(t, j.shape), j) - first, -np.inf)
+            col = gain.argmax(axis=1)
+            rows = np.arange(len(flat))
+            best_gain = gain[rows, col]
+            move_j = j[rows, col]
+            move_x = np.full(len(flat), -1, dtype=np.int64)
+
+            # Detours t -> x -> t + span with x off the path
+            off_path = (position(o, np.where(nb < n, nb, 0)) < 0) & (nb < n)
+            for span in range(2, window + 1):
+                fits = local + span < lengths[owner]
+                if not fits.any():
+                    break
+                v = flat[np.minimum(rows + span, len(flat) - 1)]
+                cost = first + node_cost[np.minimum(nb, n - 1)] + \
+                    self._pair_costs(nb, np.broadcast_to(v[:, None], nb.shape), edge_cost)
+                cost = np.where(off_path & fits[:, None], cost, np.inf)
+                pick = cost.argmin(axis=1)
+                g = interior(rows, np.minimum(rows + span, len(flat) - 1)) - cost[rows, pick]
+                better = g > best_gain
+                best_gain = np.where(better, g, best_gain)
+                move_j = np.where(better, rows + span, move_j)
+                move_x = np.where(better, nb[rows, pick], move_x)
+
+            # Best position of every path (owner groups are contiguous)
+            best_t = np.lexsort((-best_gain, owner))[starts]
+            next_active = []
+            for r, (a, p) in enumerate(active):
+                i = best_t[r]
+                if not best_gain[i] > 1e-9:
+                    continue
+                x = [move_x[i]] if move_x[i] >= 0 else []
+                p = np.concatenate([p[:local[i] + 1], x, p[move_j[i] - starts[r]:]]).astype(np.int64)
+                out[a] = self.node_ids[p].tolist()
+                if len(p) >= 3:
+                    next_active.append((a, p))
+            active = next_active
+        return out
+
+    def fitness_batch(self, paths, weights=(0.33, 0.33, 0.34), bw_demand=0):
+        """
+        Scores a list of paths (node id sequences) in one vectorized pass.
+        Returns the calculate_fitness metrics as arrays aligned with `paths`.
+        With `bw_demand` > 0, paths over edges lacking residual capacity are invalid.
+        """
+        path_count = len(paths)
+        if self.edge_count == 0:
+            return {
+                "fitness": np.full(path_count, np.inf),
+                "total_delay": np.full(path_count, np.inf),
+                "total_reliability": np.zeros(path_count),
+                "resource_cost": np.full(path_count, np.inf)
+            }
+
+        lengths, flat_idx, owner, starts, ends = self._flatten(paths)
+        total = len(flat_idx)
+
+        # A path is invalid if it is too short, has an unknown node or a missing edge
+        invalid = lengths < 2
+        unknown = flat_idx < 0
+        if unknown.any():
+            invalid[owner[unknown]] = True
+
+        hop_owner, hop_edges = self._hops(lengths, flat_idx, owner, ends)
+        missing = hop_edges < 0
+        if missing.any():
+            invalid[hop_owner[missing]] = True
+        hop_edges = np.maximum(hop_edges, 0)
+        if bw_demand > 0:
+            invalid[hop_owner[self.residual_bandwidth[hop_edges] < bw_demand]] = True
+
+        # Intermediate nodes: everything except the first and last position
+        inner_mask = np.ones(total, dtype=bool)
+        inner_mask[starts[lengths > 0]] = False
+        inner_mask[ends[lengths > 0] - 1] = False
+        inner_pos = np.flatnonzero(inner_mask)
+        inner_owner = owner[inner_pos]
+        inner_nodes = np.maximum(flat_idx[inner_pos], 0)
+
+        def per_path(owner_of, values):
+            # bincount returns ints for empty input, so force float sums
+            return np.bincount(owner_of, weights=values,
+                               minlength=path_count).astype(np.float64, copy=False)
+
+        total_delay = per_path(inner_owner, self.node_processing_delay[inner_nodes]) + \
+            per_path(hop_owner, self.edge_delay[hop_edges])
+        total_rel_cost = per_path(inner_owner, self.node_rel_cost[inner_nodes]) + \
+            per_path(hop_owner, self.edge_rel_cost[hop_edges])
+        total_res_cost = per_path(hop_owner, self.edge_res_cost[hop_edges])
+
+        w_delay, w_rel, w_res = weights
+        fitness = (w_delay * total_delay) + \
+                  (w_rel * total_rel_cost) + \
+                  (w_res * total_res_cost)
+
+        fitness[invalid] = np.inf
+        total_delay[invalid] = np.inf
+        total_res_cost[invalid] = np.inf
+        total_reliability = np.exp(-total_rel_cost)
+        total_reliability[invalid] = 0.0
+
+        return {
+            "fitness": fitness,
+            "total_delay": total_delay,
+            "total_reliability": total_reliability,
+            "resource_cost": total_res_cost
+        }
@@ -1,10 +1,10 @@
-import random
 import time
 import os
 import sys
 import csv
-import networkx as nx
+from collections import OrderedDict
 
+import numpy as np
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 src_dir = os.path.abspath(os.path.join(current_dir, ".."))
@@ -12,6 +12,12 @@ if src_dir not in sys.path:
     sys.path.append(src_dir)
 
 from network_manager import NetworkManager
+from iteration_trace import IterasyonIzi
+from stopping import DurmaKosulu, populasyon_cesitliligi
+from pareto import baskin_olmayan_siralama, kalabalik_mesafesi
+from seeding import Akis, tohum_oku, yeni_tohum
+from route_cache import RouteCache, route_key
+from result_writer import build_result, write_legacy_csv, write_result
 
 
 
@@ -24,119 +30,453 @@ def csvden_parametreleri_oku(dosya_adi="genetic_input.csv"):
     return parametreler
 
 
+# Names the UI writes to genetic_input.csv for the constructor parameters
+UI_ADLARI = {"pop_size": "populasyon", "nesil_sayisi": "nesil", "mutasyon_orani": "mutasyon"}
+
+
+def ui_parametresi(params, ad, varsayilan):
+    """params[ad], else the same parameter under its UI name, else `varsayilan`."""
+    return params.get(ad, params.get(UI_ADLARI.get(ad), varsayilan))
+
+
+class FitnessOnbellegi:
+    """Path-keyed fitness cache with LRU eviction and hit/miss counters."""
+
+    def __init__(self, kapasite=10000):
+        self.kapasite = kapasite
+        self.veri = OrderedDict()
+        self.isabet = 0
+        self.iskalama = 0
+
+    def al(self, yol):
+        anahtar = tuple(yol)
+        if anahtar in self.veri:
+            self.veri.move_to_end(anahtar)
+            self.isabet += 1
+            return self.veri[anahtar]
+        self.iskalama += 1
+        return None
+
+    def ekle(self, yol, fitness):
+        anahtar = tuple(yol)
+        self.veri[anahtar] = fitness
+        self.veri.move_to_end(anahtar)
+        while len(self.veri) > self.kapasite:
+            self.veri.popitem(last=False)
+
+    def gecersiz_kil(self, kosul):
+        """Drops every cached path for which kosul(path tuple) is true."""
+        for anahtar in [a for a in self.veri if kosul(a)]:
+            del self.veri[anahtar]
+
+    def __len__(self):
+        return len(self.veri)
+
+
 class GenetikAlgoritma:
     def __init__(self, network, agirliklar,
-                 pop_size=100, nesil_sayisi=200, mutasyon_orani=0.05):
+                 pop_size=100, nesil_sayisi=200, mutasyon_orani=0.05,
+                 onbellek_boyutu=10000, bw_talep=0, baslangic_yollari=None,
+                 k_en_kisa=5, yonelim=4.0, agirlikli_kuyruk=False, tohum=None, durma=None,
+                 iz=None, cok_amacli=False, memetik=False, yerel_pencere=4):
         self.network = network
-        self.G = network.G
+        # Per-run stream over one numpy Generator (tohum may be a seed or a
+        # Generator); seeded runs and islands are reproducible
+        self.rng = Akis(tohum)
+        # With a bandwidth demand the walks and tails only see feasible links
+        self.bw_talep = bw_talep
+        # Known good paths (e.g. the exact optimum) injected into the first generation
+        self.baslangic_yollari = baslangic_yollari or []
+        # Initial population: k-shortest seeds and the bias of the steered walks
+        self.k_en_kisa = k_en_kisa
+        self.yonelim = yonelim
+        # Mutation tails follow a per-run tree toward the target
+        self.agirlikli_kuyruk = agirlikli_kuyruk
+        self.sonraki_adim = None
+        self.kuyruklar = {}
         self.agirliklar = agirliklar
         self.pop_size = pop_size
         self.nesil_sayisi = nesil_sayisi
         self.mutasyon_orani = mutasyon_orani
-
-    def rastgele_yol(self, kaynak, hedef, max_adim=300):
+        # Shared by the generation loop and tournament selection; valid for
+        # the compiled graph and version in _onbellek_grafi
+        self.onbellek = FitnessOnbellegi(onbellek_boyutu)
+        self._onbellek_grafi = (network.compiled, network.compiled.version)
+        # Early stopping; the default runs every generation
+        self.durma = durma or DurmaKosulu()
+        # Optional IterasyonIzi: one record per generation with phase timings
+        self.iz = iz
+        # NSGA-II mode: one run returns the whole (delay, reliability, cost) front
+        self.cok_amacli = cok_amacli
+        self.pareto_cephesi = []
+        # Memetic mode: every generation is polished by local search on the
+        # weighted cost (loop removal, shortcut edges, detours over segments
+        # of up to yerel_pencere hops); the NSGA-II mode leaves it off
+        self.memetik = memetik
+        self.yerel_pencere = yerel_pencere
+        # path -> its improved path; children often repeat a parent
+        self.iyilestirilmis = FitnessOnbellegi(onbellek_boyutu)
+        # Final population and endpoints of the last run, for warm starts
+        self.son_populasyon = None
+        self._uclar = None
+
+    def fitness_toplu(self, yollar):
+        """Cached fitness for a list of paths; misses are scored in one batch."""
+        sonuclar = [self.onbellek.al(yol) for yol in yollar]
+        eksik = {}
+        for i, f in enumerate(sonuclar):
+            if f is None:
+                eksik.setdefault(tuple(yollar[i]), []).append(i)
+        if eksik:
+            yeni_yollar = list(eksik)
+            skorlar = self.network.calculate_fitness_batch(
+                yeni_yollar, self.agirliklar, self.bw_talep)["fitness"]
+            for yol, f in zip(yeni_yollar, skorlar):
+                f = float(f)
+                self.onbellek.ekle(yol, f)
+                for i in eksik[yol]:
+                    sonuclar[i] = f
+        return sonuclar
+
+    def amaclar_toplu(self, yollar):
+        """(n, 3) objectives to minimize: delay, -log reliability, resource cost."""
+        m = self.network.calculate_fitness_batch(yollar, self.agirliklar, self.bw_talep)
+        with np.errstate(divide="ignore"):
+            return np.column_stack([m["total_delay"], -np.log(m["total_reliability"]),
+                                    m["resource_cost"]])
+
+    def fitness(self, yol):
+        f = self.onbellek.al(yol)
+        if f is None:
+            f = float(self.network.calculate_fitness_batch(
+                [yol], self.agirliklar, self.bw_talep)["fitness"][0])
+            self.onbellek.ekle(yol, f)
+        return f
+
+    def yonlendirilmis_yol(self, kaynak, hedef, mesafe, komsular, max_adim=300):
+        """
+        Random walk over dense indices that never enters nodes which cannot
+        reach the target and prefers neighbors closer to it (BFS hop distance).
+        """
         yol = [kaynak]
+        ziyaret_edilenler = {kaynak}
         mevcut = kaynak
         for _ in range(max_adim):
-            komsular = list(self.G.neighbors(mevcut))
-            if not komsular:
+            adaylar = [v for v in komsular[mevcut]
+                       if v not in ziyaret_edilenler and mesafe[v] != float("inf")]
+            if not adaylar:
                 return None
-            secilen = random.choice(komsular)
-            if secilen not in yol:
-                yol.append(secilen)
-                if secilen == hedef:
-                    return yol
-                mevcut = secilen
+            agirlik = [self.yonelim if mesafe[v] < mesafe[mevcut] else 1.0 for v in adaylar]
+            secilen = self.rng.choices(adaylar, weights=agirlik)[0]
+            yol.append(secilen)
+            if secilen == hedef:
+                return yol
+            ziyaret_edilenler.add(secilen)
+            mevcut = secilen
         return None
 
-    def baslangic_populasyonu(self, kaynak, hedef):
-        pop = []
-        while len(pop) < self.pop_size:
-            p = self.rastgele_yol(kaynak, hedef)
+    def baslangic_populasyonu(self, kaynak, hedef, mevcut=None):
+        """
+        Seeds (`mevcut`, given paths, then k-shortest paths) plus
+        distance-steered walks. Returns [] at once if the target is
+        unreachable and runs a bounded number of walks, so startup time does
+        not depend on luck.
+        """
+        cg = self.network.compiled
+        kaynak_idx, hedef_idx = cg.to_index([kaynak, hedef])
+        if kaynak_idx < 0 or hedef_idx < 0 or kaynak_idx == hedef_idx:
+            return []
+        mesafe = cg.hop_distances(hedef_idx, self.bw_talep)
+        if mesafe[kaynak_idx] == float("inf"):
+            return []
+
+        pop = [list(p) for p in (mevcut or []) + self.baslangic_yollari][:self.pop_size]
+        tohumlar = self.network.find_initial_paths(kaynak, hedef, self.k_en_kisa, self.bw_talep)
+        skorlar = self.fitness_toplu(tohumlar)
+        pop += [p for p, f in zip(tohumlar, skorlar) if f != float("inf")]
+        pop = pop[:self.pop_size]
+
+        uygun = cg.feasible_edges(self.bw_talep)[cg.slot_edge]
+        komsu_listesi = [cg.indices[bas:son][uygun[bas:son]].tolist()
+                         for bas, son in zip(cg.indptr[:-1], cg.indptr[1:])]
+        mesafe = mesafe.tolist()
+
+        deneme = 0
+        while len(pop) < self.pop_size and deneme < self.pop_size * 20:
+            deneme += 1
+            p = self.yonlendirilmis_yol(kaynak_idx, hedef_idx, mesafe, komsu_listesi)
             if p:
-                pop.append(p)
+                pop.append(cg.node_ids[p].tolist())
+
+        # Out of attempts: repeat what we have instead of spinning
+        i = 0
+        while pop and len(pop) < self.pop_size:
+            pop.append(list(pop[i]))
+            i += 1
         return pop
 
     def turnuva_secimi(self, populasyon, k=3):
-        adaylar = random.sample(populasyon, k)
-        adaylar.sort(
-            key=lambda p: self.network.calculate_fitness(p, self.agirliklar)["fitness"]
-        )
+        adaylar = self.rng.sample(populasyon, k)
+        adaylar.sort(key=self.fitness)
         return adaylar[0]
 
     def caprazlama(self, p1, p2):
         ortaklar = list(set(p1[1:-1]) & set(p2[1:-1]))
         if not ortaklar:
             return p1[:]
-        c = random.choice(ortaklar)
+        c = self.rng.choice(ortaklar)
         return p1[:p1.index(c)] + p2[p2.index(c):]
 
+    def kuyruk_agaci_kur(self, hedef):
+        """
+        One shortest-path tree toward `hedef` per run, stored as a next-hop
+        array: hop count by default, weighted fitness cost with agirlikli_kuyruk.
+        """
+        cg = self.network.compiled
+        hedef_idx = cg.to_index([hedef])[0]
+        self.kuyruklar = {}
+        if hedef_idx < 0:
+            self.sonraki_adim = None
+            return
+        if self.agirlikli_kuyruk:
+            _, sonraki = cg.shortest_path_tree(hedef_idx, self.agirliklar, self.bw_talep)
+        else:
+            _, sonraki = cg.hop_tree(hedef_idx, self.bw_talep)
+        self.sonraki_adim = sonraki.tolist()
+        self.dugum_sirasi = {int(d): i for i, d in enumerate(cg.node_ids)}
+        self.dugum_kimlikleri = cg.node_ids.tolist()
+
+    def kuyruk(self, dugum):
+        """Shortest tail from `dugum` to the run's target (node ids), None if unreachable."""
+        if dugum in self.kuyruklar:
+            return self.kuyruklar[dugum]
+        i = self.dugum_sirasi.get(dugum)
+        if i is None or self.sonraki_adim is None:
+            return None
+        yol = [i]
+        while self.sonraki_adim[yol[-1]] >= 0:
+            yol.append(self.sonraki_adim[yol[-1]])
+        # Only the target itself has no next hop; otherwise it is unreachable
+        sonuc = [self.dugum_kimlikleri[j] for j in yol] if len(yol) > 1 else None
+        self.kuyruklar[dugum] = sonuc
+        return sonuc
+
     def mutasyon(self, yol, hedef):
-        if random.random() > self.mutasyon_orani or len(yol) < 3:
+        if self.rng.random() > self.mutasyon_orani or len(yol) < 3:
             return yol
-        idx = random.randint(1, len(yol) - 2)
-        try:
-            kuyruk = nx.shortest_path(self.G, yol[idx], hedef)
-            return yol[:idx] + kuyruk
-        except:
+        idx = self.rng.randint(1, len(yol) - 2)
+        kuyruk = self.kuyruk(yol[idx])
+        if kuyruk is None:
             return yol
-
-    def calistir(self, kaynak, hedef):
-        populasyon = self.baslangic_populasyonu(kaynak, hedef)
+        return yol[:idx] + kuyruk
+
+    def yerel_arama(self, yollar):
+        """
+        Local search on the compiled graph (see improve_paths). Paths seen
+        before are answered from iyilestirilmis; the rest go in one batch.
+        """
+        sonuclar = [self.iyilestirilmis.al(yol) for yol in yollar]
+        eksik = list(dict.fromkeys(tuple(yol) for yol, s in zip(yollar, sonuclar) if s is None))
+        if eksik:
+            yeni = self.network.compiled.improve_paths(eksik, self.agirliklar, self.bw_talep,
+                                                       self.yerel_pencere)
+            for yol, iyi in zip(eksik, yeni):
+                self.iyilestirilmis.ekle(yol, iyi)
+                # An improved path is a fixed point as far as we know
+                self.iyilestirilmis.ekle(iyi, iyi)
+            sonuclar = [self.iyilestirilmis.al(yol) if s is None else s
+                        for yol, s in zip(yollar, sonuclar)]
+        return [list(yol) for yol in sonuclar]
+
+    def hazirla(self, hedef):
+        """Per-run state that does not depend on the population: fitness cache and tails."""
+        cg = self.network.compiled
+        onceki, surum = self._onbellek_grafi
+        if self.bw_talep > 0 or onceki is not cg:
+            # Residual capacity may have changed, or the topology was reloaded
+            self.onbellek = FitnessOnbellegi(self.onbellek.kapasite)
+        elif surum != cg.version:
+            # Drop the cached fitness of every path over a changed link or node
+            ciftler, dugumler, _ = cg.changes_since(surum)
+            kimlik = cg.node_ids
+            degisen_ciftler = {frozenset((int(kimlik[u]), int(kimlik[v]))) for u, v in ciftler}
+            degisen_dugumler = {int(kimlik[d]) for d in dugumler}
+            self.onbellek.gecersiz_kil(lambda yol: not degisen_dugumler.isdisjoint(yol) or any(
+                frozenset(kenar) in degisen_ciftler for kenar in zip(yol, yol[1:])))
+        self._onbellek_grafi = (cg, cg.version)
+        self.kuyruk_agaci_kur(hedef)
+        # Improvements depend on the costs, which may have changed
+        self.iyilestirilmis = FitnessOnbellegi(self.iyilestirilmis.kapasite)
+        self.durma.baslat()
+
+    def evrim(self, populasyon, hedef, nesil_sayisi):
+        """
+        Runs `nesil_sayisi` generations from `populasyon`.
+        Returns (new population, best path, best fitness) over those generations.
+        """
         en_iyi_yol = None
         en_iyi_fitness = float("inf")
-
-        for _ in range(self.nesil_sayisi):
-            degerlendirilmis = []
-            for yol in populasyon:
-                f = self.network.calculate_fitness(yol, self.agirliklar)["fitness"]
-                if f != float("inf"):
-                    degerlendirilmis.append((yol, f))
-
-            if not degerlendirilmis:
-                continue
+        if self.memetik:
+            populasyon = self.yerel_arama(populasyon)
+
+        for _ in range(nesil_sayisi):
+            # Cached paths are free; the rest are scored in one vectorized pass
+            t_fitness = time.perf_counter()
+            skorlar = self.fitness_toplu(populasyon)
+            t_secim = time.perf_counter()
+            degerlendirilmis = [
+                (yol, f) for yol, f in zip(populasyon, skorlar) if f != float("inf")
+            ]
 
             degerlendirilmis.sort(key=lambda x: x[1])
 
-            if degerlendirilmis[0][1] < en_iyi_fitness:
+            if degerlendirilmis and degerlendirilmis[0][1] < en_iyi_fitness:
                 en_iyi_yol, en_iyi_fitness = degerlendirilmis[0]
 
-            yeni_pop = [degerlendirilmis[0][0]]  # elitizm
-
-            while len(yeni_pop) < self.pop_size:
-                ebeveyn1 = self.turnuva_secimi([p for p, _ in degerlendirilmis])
-                ebeveyn2 = self.turnuva_secimi([p for p, _ in degerlendirilmis])
-                cocuk = self.mutasyon(self.caprazlama(ebeveyn1, ebeveyn2), hedef)
-                yeni_pop.append(cocuk)
-
-            populasyon = yeni_pop
-
+            cesitlilik = populasyon_cesitliligi(populasyon) if self.durma.min_cesitlilik else None
+            dur = self.durma.kontrol(self.durma.iterasyon + 1, en_iyi_fitness, cesitlilik=cesitlilik)
+
+            if degerlendirilmis and not dur:
+                yeni_pop = [degerlendirilmis[0][0]]  # elitizm
+                ebeveynler = [p for p, _ in degerlendirilmis]
+
+                while len(yeni_pop) < self.pop_size:
+                    ebeveyn1 = self.turnuva_secimi(ebeveynler)
+                    ebeveyn2 = self.turnuva_secimi(ebeveynler)
+                    cocuk = self.mutasyon(self.caprazlama(ebeveyn1, ebeveyn2), hedef)
+                    yeni_pop.append(cocuk)
+
+                populasyon = self.yerel_arama(yeni_pop) if self.memetik else yeni_pop
+
+            if self.iz:
+                self.iz.kaydet(self.durma.iterasyon, skorlar, len(skorlar), {
+                    "fitness": t_secim - t_fitness,
+                    "secim": time.perf_counter() - t_secim,
+                })
+            if dur:
+                break
+
+        return populasyon, en_iyi_yol, en_iyi_fitness
+
+    def pareto_turnuvasi(self, populasyon, sira, mesafe):
+        """Binary tournament: lower front wins, then the less crowded one."""
+        i = self.rng.randrange(len(populasyon))
+        j = self.rng.randrange(len(populasyon))
+        return populasyon[i] if (sira[i], -mesafe[i]) <= (sira[j], -mesafe[j]) else populasyon[j]
+
+    def pareto_sec(self, yollar):
+        """
+        NSGA-II survival: distinct valid paths ordered by front, then by
+        crowding distance, cut to pop_size. Returns (paths, objectives).
+        """
+        yollar = [list(yol) for yol in dict.fromkeys(tuple(yol) for yol in yollar)]
+        amaclar = self.amaclar_toplu(yollar)
+        gecerli = np.flatnonzero(np.isfinite(amaclar).all(axis=1))
+        amaclar = amaclar[gecerli]
+        sira = baskin_olmayan_siralama(amaclar)
+        mesafe = kalabalik_mesafesi(amaclar, sira)
+        secilen = np.lexsort((-mesafe, sira))[:self.pop_size]
+        return [yollar[gecerli[i]] for i in secilen], amaclar[secilen]
+
+    def pareto_evrim(self, populasyon, hedef, nesil_sayisi):
+        """
+        Runs `nesil_sayisi` NSGA-II generations from `populasyon`. Parents
+        and children compete together for the next population, so the
+        front never loses a non-dominated path. Returns (population,
+        objectives); the population is sorted by front.
+        """
+        agirliklar = np.asarray(self.agirliklar, dtype=np.float64)
+        populasyon, amaclar = self.pareto_sec(populasyon)
+
+        for _ in range(nesil_sayisi):
+            if not populasyon:
+                break
+            t_fitness = time.perf_counter()
+            sira = baskin_olmayan_siralama(amaclar)
+            mesafe = kalabalik_mesafesi(amaclar, sira)
+            # The weighted sum drives early stopping and the trace
+            skorlar = amaclar @ agirliklar
+            t_secim = time.perf_counter()
+
+            cesitlilik = populasyon_cesitliligi(populasyon) if self.durma.min_cesitlilik else None
+            dur = self.durma.kontrol(self.durma.iterasyon + 1, float(skorlar.min()),
+                                     cesitlilik=cesitlilik)
+            if not dur:
+                cocuklar = []
+                while len(cocuklar) < self.pop_size:
+                    ebeveyn1 = self.pareto_turnuvasi(populasyon, sira, mesafe)
+                    ebeveyn2 = self.pareto_turnuvasi(populasyon, sira, mesafe)
+                    cocuklar.append(self.mutasyon(self.caprazlama(ebeveyn1, ebeveyn2), hedef))
+                populasyon, amaclar = self.pareto_sec(populasyon + cocuklar)
+
+            if self.iz:
+                self.iz.kaydet(self.durma.iterasyon, skorlar, len(skorlar), {
+                    "fitness": t_secim - t_fitness,
+                    "secim": time.perf_counter() - t_secim,
+                })
+            if dur:
+                break
+
+        return populasyon, amaclar
+
+    def cepheyi_kaydet(self, populasyon, amaclar):
+        """Keeps the first front as pareto_cephesi (NetworkManager.pareto_paths format)."""
+        self.pareto_cephesi = []
+        if not populasyon:
+            return
+        sira = baskin_olmayan_siralama(amaclar)
+        fitness = amaclar @ np.asarray(self.agirliklar, dtype=np.float64)
+        for i in np.flatnonzero(sira == 0):
+            self.pareto_cephesi.append({
+                "path": populasyon[i],
+                "total_delay": float(amaclar[i, 0]),
+                "total_reliability": float(np.exp(-amaclar[i, 1])),
+                "resource_cost": float(amaclar[i, 2]),
+                "fitness": float(fitness[i]),
+            })
+        self.pareto_cephesi.sort(key=lambda r: r["total_delay"])
+
+    def sicak_populasyon(self):
+        """
+        The best distinct paths of the last run's final population, up to
+        half the population size, scored on the current graph (hazirla has
+        already dropped the cached fitness of paths over changed links).
+        """
+        farkli = [list(yol) for yol in dict.fromkeys(tuple(yol) for yol in self.son_populasyon)]
+        skorlar = self.fitness_toplu(farkli)
+        gecerli = sorted((f, i) for i, f in enumerate(skorlar) if f != float("inf"))
+        return [farkli[i] for _, i in gecerli[:self.pop_size // 2]]
+
+    def calistir(self, kaynak, hedef, sicak=False, nesil_sayisi=None):
+        """
+        Runs the GA. With sicak=True a repeat run on the same endpoints keeps
+        the best of the previous final population; fresh seeds and walks
+        fill the rest, since a converged population alone rarely leaves a
+        path that got worse.
+        """
+        self.hazirla(hedef)
+        mevcut = None
+        if sicak and self.son_populasyon and self._uclar == (kaynak, hedef):
+            mevcut = self.sicak_populasyon()
+        populasyon = self.baslangic_populasyonu(kaynak, hedef, mevcut)
+        self._uclar = (kaynak, hedef)
+        if not populasyon:
+            self.son_populasyon = None
+            return None, float("inf")
+        if self.cok_amacli:
+            populasyon, amaclar = self.pareto_evrim(
+                populasyon, hedef, nesil_sayisi or self.nesil_sayisi)
+            self.cepheyi_kaydet(populasyon, amaclar)
+            self.son_populasyon = populasyon
+            self.durma.tamamla()
+            # The point of the front that the current weights prefer
+            en_iyi = min(self.pareto_cephesi, key=lambda r: r["fitness"], default=None)
+            return (en_iyi["path"], en_iyi["fitness"]) if en_iyi else (None, float("inf"))
+        self.son_populasyon, en_iyi_yol, en_iyi_fitness = self.evrim(
+            populasyon, hedef, nesil_sayisi or self.nesil_sayisi)
+        self.durma.tamamla()
         return en_iyi_yol, en_iyi_fitness
 
-def save_minimal_path(yol, filename=r"../data/genetic_path.csv"):
-    """
-    Exports the found path to a clean, precise, and minimalist CSV file.
-    Format: order, node_id
-    """
-    if not yol:
-        return
-
-    # Resolve absolute path relative to script location
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    abs_path = os.path.abspath(os.path.join(current_dir, filename))
-
-    try:
-        with open(abs_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            # Minimalist Header
-            writer.writerow(["order", "node_id"])
-            # Write path sequence
-            for i, node in enumerate(yol):
-                writer.writerow([i, node])
-        print(f"Minimal path exported to: {abs_path}")
-    except Exception as e:
-        print(f"Error exporting minimal path CSV: {e}")
-
 if __name__ == "__main__":
 
     # 🔹 CSV’den input oku
@@ -153,35 +493,71 @@ if __name__ == "__main__":
     )
 
     network = NetworkManager()
-    ga = GenetikAlgoritma(network, agirliklar, 100, 200, 0.05)
-
-    baslangic = time.time()
-    yol, fitness = ga.calistir(KAYNAK, HEDEF)
-    sure = time.time() - baslangic
-
-    if yol:
-        save_minimal_path(yol)
+    bw_talep = float(p.get("bw_talep", 0))
+    cok_amacli = bool(int(float(p.get("cok_amacli", 0))))
+
+    # Same request on the same topology: reuse the stored route
+    onbellek, anahtar, kayit = None, None, None
+    if int(float(p.get("rota_onbellegi", 1))) and not p.get("iz_dosyasi"):
+        onbellek = RouteCache.for_folder(network.data_folder)
+        anahtar = route_key(network, "genetics.py", KAYNAK, HEDEF, agirliklar, bw_talep,
+                            {k: v for k, v in p.items() if k != "rota_onbellegi"})
+        kayit = onbellek.get(anahtar)
+    isabet = kayit is not None
+
+    if isabet:
+        print("Route cache hit.")
+    else:
+        # A run without a seed still records one, so it can be replayed
+        tohum = tohum_oku(p)
+        tohum = yeni_tohum() if tohum is None else tohum
+        ga = GenetikAlgoritma(network, agirliklar,
+                              int(float(ui_parametresi(p, "pop_size", 100))),
+                              int(float(ui_parametresi(p, "nesil_sayisi", 200))),
+                              float(ui_parametresi(p, "mutasyon_orani", 0.05)),
+                              bw_talep=bw_talep,
+                              agirlikli_kuyruk=bool(int(float(p.get("agirlikli_kuyruk", 0)))),
+                              tohum=tohum, durma=DurmaKosulu.parametrelerden(p),
+                              cok_amacli=cok_amacli,
+                              memetik=bool(int(float(p.get("memetik", 0)))),
+                              yerel_pencere=int(float(p.get("yerel_pencere", 4))))
+        # Optional per-generation trace, relative to the data folder
+        if p.get("iz_dosyasi"):
+            ga.iz = IterasyonIzi(os.path.join(current_dir, "../data", p["iz_dosyasi"]))
+
+        baslangic = time.time()
+        yol, _ = ga.calistir(KAYNAK, HEDEF)
+        sure = time.time() - baslangic
+        if ga.iz:
+            ga.iz.kapat()
+        kayit = build_result(network, "ga", KAYNAK, HEDEF, agirliklar, yol, sure, bw_talep,
+                             p, tohum, ga.durma.ozet())
+        kayit["fitness_onbellegi"] = {"isabet": ga.onbellek.isabet,
+                                      "iskalama": ga.onbellek.iskalama}
+        if cok_amacli:
+            kayit["pareto"] = ga.pareto_cephesi
+        if onbellek is not None:
+            onbellek.put(anahtar, network.topology_hash, kayit)
+    kayit["onbellek"] = isabet
+
+    # One JSON document (with the Pareto front), plus the CSV pair the UI reads:
+    # the results panel opens genetics_output.csv (from its "Genetics" label),
+    # the map highlights genetic_path.csv
+    write_result(os.path.join(current_dir, "../data/genetic_result.json"), kayit)
+    write_legacy_csv(kayit, os.path.join(current_dir, "../data/genetics_output.csv"),
+                     os.path.join(current_dir, "../data/genetic_path.csv"))
 
-    metrikler = network.calculate_fitness(yol, agirliklar)
     print("\n")
     print("Genetik Algoritma Sonuclari:")
-    print("En İyi Yol:", " → ".join(map(str, yol)))
-    print("Toplam Gecikme (ms):", round(metrikler["total_delay"], 4))
-    print("Guvenilirlik (%):", round(metrikler["total_reliability"] * 100, 2))
-    print("Kaynak Maliyeti:", round(metrikler["resource_cost"], 6))
-    print("Fitness:", round(metrikler["fitness"], 6))
-    print("Sure (sn):", round(sure, 4))
-    
-    with open("../data/genetics_output.csv", "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Alan", "Deger"])
-        writer.writerow(["Kaynak", KAYNAK])
-        writer.writerow(["Hedef", HEDEF])
-        writer.writerow(["Yol", " → ".join(map(str, yol))])
-        writer.writerow(["Toplam Gecikme (ms)", round(metrikler["total_delay"], 4)])
-        writer.writerow(["Guvenilirlik (%)", round(metrikler["total_reliability"] * 100, 2)])
-        writer.writerow(["Kaynak Maliyeti", round(metrikler["resource_cost"], 6)])
-        writer.writerow(["Fitness", round(metrikler["fitness"], 6)])
-        writer.writerow(["Sure (sn)", round(sure, 4)])
-
-
+    print("En İyi Yol:", " → ".join(map(str, kayit["yol"] or [])))
+    print("Toplam Gecikme (ms):", round(kayit["total_delay"], 4))
+    print("Guvenilirlik (%):", round(kayit["total_reliability"] * 100, 2))
+    print("Kaynak Maliyeti:", round(kayit["resource_cost"], 6))
+    print("Fitness:", round(kayit["fitness"], 6))
+    print("Sure (sn):", round(kayit["sure"], 4))
+    print("Optimum Fitness:", round(kayit["optimum_fitness"], 6), "| Optimallik Farki (%):",
+          round(kayit["optimallik_farki"], 4))
+    print("Fitness Onbellegi (isabet/iskalama):", kayit["fitness_onbellegi"]["isabet"], "/",
+          kayit["fitness_onbellegi"]["iskalama"])
+    print("Durma:", kayit["durma_nedeni"], "| Nesil:", kayit["durma_iterasyonu"])
+    print("Tohum:", kayit["tohum"])
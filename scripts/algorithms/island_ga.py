@@ -0,0 +1,197 @@
+"""
+Island-model GA over a process pool.
+
+Every island is an independent GenetikAlgoritma population with its own
+seeded RNG. Islands evolve `goc_araligi` generations at a time. After each
+epoch the best `goc_sayisi` paths of island i replace the worst ones of
+island i+1 (ring topology).
+
+Each epoch task carries the island's population and RNG state, so the result
+only depends on the seeds, never on which worker ran which island.
+
+    python island_ga.py --adalar 8 --workers 8 --tohum 42
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from genetics import GenetikAlgoritma, csvden_parametreleri_oku, ui_parametresi
+from network_manager import NetworkManager
+from seeding import Akis, alt_tohumlar, tohum_oku, yeni_tohum
+from stopping import DurmaKosulu, populasyon_cesitliligi
+
+# Per-worker state, set by _worker_init
+_network = None
+_ayar = None
+_adalar = {}
+
+
+def _worker_init(compiled, weights, ayar):
+    global _network, _ayar, _adalar
+    _network = NetworkManager.from_compiled(compiled, weights=weights)
+    _ayar = ayar
+    _adalar = {}
+
+
+def _ada(ada_no):
+    """The worker's GenetikAlgoritma for an island; keeps its fitness cache between epochs."""
+    ga = _adalar.get(ada_no)
+    if ga is None:
+        ga = GenetikAlgoritma(_network, _ayar["agirliklar"], **_ayar["ga"])
+        ga.hazirla(_ayar["hedef"])
+        _adalar[ada_no] = ga
+    return ga
+
+
+def _worker_epoch(gorev):
+    ada_no, populasyon, rng_durumu, tohum, nesil = gorev
+    ga = _ada(ada_no)
+    if rng_durumu is None:
+        ga.rng = Akis(tohum)
+        populasyon = ga.baslangic_populasyonu(_ayar["kaynak"], _ayar["hedef"])
+    else:
+        ga.rng.durum = rng_durumu
+
+    en_iyi_yol, en_iyi_fitness = None, float("inf")
+    if populasyon:
+        populasyon, en_iyi_yol, en_iyi_fitness = ga.evrim(populasyon, _ayar["hedef"], nesil)
+    skorlar = ga.fitness_toplu(populasyon)
+    return ada_no, populasyon, skorlar, ga.rng.durum, en_iyi_yol, en_iyi_fitness
+
+
+def _goc(sonuclar, goc_sayisi):
+    """Ring migration: the top `goc_sayisi` of island i replace the worst of island i+1."""
+    gocmenler = []
+    for _, populasyon, skorlar, _, _, _ in sonuclar:
+        sirali = sorted(range(len(populasyon)), key=lambda j: skorlar[j])
+        gocmenler.append([list(populasyon[j]) for j in sirali[:goc_sayisi]
+                          if skorlar[j] != float("inf")])
+
+    yeni = []
+    for i, (ada_no, populasyon, skorlar, rng_durumu, _, _) in enumerate(sonuclar):
+        gelen = gocmenler[i - 1]
+        populasyon = list(populasyon)
+        if gelen and populasyon:
+            en_kotu = sorted(range(len(populasyon)), key=lambda j: skorlar[j])[-len(gelen):]
+            for j, yol in zip(en_kotu, gelen):
+                populasyon[j] = yol
+        yeni.append((ada_no, populasyon, rng_durumu))
+    return yeni
+
+
+class AdaModeli:
+    """
+    Same interface as GenetikAlgoritma (calistir -> (path, fitness)) over
+    `ada_sayisi` islands. The remaining keyword arguments go to every
+    island's GenetikAlgoritma; pop_size and nesil_sayisi are per island.
+    After a run, `rapor` holds each island's seed and best fitness per epoch.
+    """
+
+    def __init__(self, network, agirliklar, ada_sayisi=4, goc_araligi=20, goc_sayisi=2,
+                 workers=None, tohum=None, nesil_sayisi=200, durma=None, **ga_parametreleri):
+        self.network = network
+        self.agirliklar = tuple(agirliklar)
+        self.ada_sayisi = max(1, int(ada_sayisi))
+        self.goc_araligi = max(1, int(goc_araligi))
+        self.goc_sayisi = int(goc_sayisi)
+        self.workers = workers
+        self.tohum = tohum
+        self.nesil_sayisi = nesil_sayisi
+        self.ga_parametreleri = ga_parametreleri
+        # Checked after every epoch on the global best and mean island diversity
+        self.durma = durma or DurmaKosulu()
+        self.rapor = []
+
+    def calistir(self, kaynak, hedef):
+        ayar = {"kaynak": int(kaynak), "hedef": int(hedef), "agirliklar": self.agirliklar,
+                "ga": self.ga_parametreleri}
+        # Independent, reproducible stream per island
+        tohumlar = alt_tohumlar(self.tohum, self.ada_sayisi)
+
+        self.rapor = [{"ada": i, "tohum": tohumlar[i], "en_iyi_fitness": float("inf"),
+                       "gecmis": []} for i in range(self.ada_sayisi)]
+        en_iyi_yol, en_iyi_fitness = None, float("inf")
+        durumlar = [(i, None, None) for i in range(self.ada_sayisi)]
+
+        self.durma.baslat()
+        workers = max(1, min(self.workers or os.cpu_count() or 1, self.ada_sayisi))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init,
+                                 initargs=(self.network.compiled, self.network.weights,
+                                           ayar)) as executor:
+            kalan = self.nesil_sayisi
+            while kalan > 0:
+                nesil = min(self.goc_araligi, kalan)
+                kalan -= nesil
+                gorevler = [(i, pop, rng, tohumlar[i], nesil) for i, pop, rng in durumlar]
+                sonuclar = list(executor.map(_worker_epoch, gorevler))
+
+                for ada_no, _, _, _, yol, fitness in sonuclar:
+                    kayit = self.rapor[ada_no]
+                    if fitness < kayit["en_iyi_fitness"]:
+                        kayit["en_iyi_fitness"] = fitness
+                    kayit["gecmis"].append(kayit["en_iyi_fitness"])
+                    if fitness < en_iyi_fitness:
+                        en_iyi_yol, en_iyi_fitness = yol, fitness
+
+                cesitlilik = float(np.mean([populasyon_cesitliligi(s[1]) for s in sonuclar])) \
+                    if self.durma.min_cesitlilik else None
+                if self.durma.kontrol(self.nesil_sayisi - kalan, en_iyi_fitness,
+                                      cesitlilik=cesitlilik):
+                    break
+                if kalan > 0 and self.ada_sayisi > 1:
+                    durumlar = _goc(sonuclar, self.goc_sayisi)
+                else:
+                    durumlar = [(s[0], s[1], s[3]) for s in sonuclar]
+
+        self.durma.tamamla()
+        return en_iyi_yol, en_iyi_fitness
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Island-model GA")
+    parser.add_argument("--adalar", type=int, default=4, help="Number of islands")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--goc-araligi", type=int, default=20,
+                        help="Generations between migrations")
+    parser.add_argument("--goc-sayisi", type=int, default=2, help="Elites sent per migration")
+    parser.add_argument("--tohum", type=int, default=None,
+                        help="Base seed (default: tohum from the input CSV, else a fresh one)")
+    args = parser.parse_args()
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    p = csvden_parametreleri_oku(os.path.join(current_dir, "../data/genetic_input.csv"))
+    agirliklar = (float(p["agirlik_delay"]),
+                  float(p["agirlik_reliability"]),
+                  float(p["agirlik_cost"]))
+
+    tohum = args.tohum if args.tohum is not None else tohum_oku(p)
+    tohum = yeni_tohum() if tohum is None else tohum
+
+    network = NetworkManager()
+    model = AdaModeli(network, agirliklar, args.adalar, args.goc_araligi, args.goc_sayisi,
+                      args.workers, tohum,
+                      pop_size=int(float(ui_parametresi(p, "pop_size", 100))),
+                      nesil_sayisi=int(float(ui_parametresi(p, "nesil_sayisi", 200))),
+                      mutasyon_orani=float(ui_parametresi(p, "mutasyon_orani", 0.05)),
+                      bw_talep=float(p.get("bw_talep", 0)),
+                      agirlikli_kuyruk=bool(int(float(p.get("agirlikli_kuyruk", 0)))),
+                      memetik=bool(int(float(p.get("memetik", 0)))),
+                      yerel_pencere=int(float(p.get("yerel_pencere", 4))),
+                      durma=DurmaKosulu.parametrelerden(p))
+    start_time = time.time()
+    yol, fitness = model.calistir(int(p["kaynak"]), int(p["hedef"]))
+    sure = time.time() - start_time
+
+    for kayit in model.rapor:
+        print(f"Ada {kayit['ada']}: en iyi fitness {kayit['en_iyi_fitness']:.6f}")
+    print(f"En iyi yol: {' → '.join(map(str, yol)) if yol else 'BULUNAMADI'}")
+    print(f"Fitness: {fitness:.6f} | Sure (sn): {sure:.3f}")
+    print(f"Durma: {model.durma.durma_nedeni} | Nesil: {model.durma.durma_iterasyonu}")
+    print(f"Tohum: {tohum}")
+
+
+if __name__ == "__main__":
+    main()
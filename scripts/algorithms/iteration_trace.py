@@ -0,0 +1,91 @@
+"""
+Per-iteration convergence trace and profiling hooks for the optimizers.
+
+IterasyonIzi writes one record per ACO iteration / GA generation as soon as
+it is produced (JSON lines, or CSV when the file name ends in .csv):
+
+    iterasyon, en_iyi, ortalama, en_kotu   fitness of this iteration's valid paths
+    genel_en_iyi                           best fitness so far
+    gecerli_orani                          valid paths / ants (or population)
+    sure_<faz>                             seconds spent in each phase
+
+profille() runs any callable under cProfile and dumps the stats.
+"""
+import cProfile
+import csv
+import io
+import json
+import math
+import pstats
+import sys
+
+import numpy as np
+
+
+class IterasyonIzi:
+    def __init__(self, dosya_yolu, ek_alanlar=None):
+        self.dosya_yolu = dosya_yolu
+        self.csv_bicimi = str(dosya_yolu).lower().endswith(".csv")
+        # Constant fields repeated on every record (algo, kaynak, hedef, ...)
+        self.ek_alanlar = dict(ek_alanlar or {})
+        self.dosya = open(dosya_yolu, "w", newline="", encoding="utf-8")
+        self.yazici = None
+        self.genel_en_iyi = float("inf")
+
+    def kaydet(self, iterasyon, fitnessler, aday_sayisi, fazlar):
+        """
+        Writes one record. `fitnessler` holds the fitness of every candidate
+        that produced a path (inf for invalid ones), `aday_sayisi` is the
+        number of ants or individuals, `fazlar` maps phase name to seconds.
+        """
+        fitnessler = np.asarray(fitnessler, dtype=np.float64)
+        gecerli = fitnessler[np.isfinite(fitnessler)]
+        if gecerli.size:
+            self.genel_en_iyi = min(self.genel_en_iyi, float(gecerli.min()))
+        kayit = dict(self.ek_alanlar)
+        kayit.update({
+            "iterasyon": iterasyon,
+            "en_iyi": float(gecerli.min()) if gecerli.size else None,
+            "ortalama": float(gecerli.mean()) if gecerli.size else None,
+            "en_kotu": float(gecerli.max()) if gecerli.size else None,
+            "genel_en_iyi": self.genel_en_iyi if math.isfinite(self.genel_en_iyi) else None,
+            "gecerli_orani": gecerli.size / aday_sayisi if aday_sayisi else 0.0,
+        })
+        kayit.update({f"sure_{ad}": sure for ad, sure in fazlar.items()})
+
+        if self.csv_bicimi:
+            if self.yazici is None:
+                self.yazici = csv.DictWriter(self.dosya, fieldnames=list(kayit))
+                self.yazici.writeheader()
+            self.yazici.writerow(kayit)
+        else:
+            self.dosya.write(json.dumps(kayit) + "\n")
+        # Streaming: a crashed or killed run still leaves its trace behind
+        self.dosya.flush()
+
+    def kapat(self):
+        if not self.dosya.closed:
+            self.dosya.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.kapat()
+
+
+def profille(fonksiyon, dosya_yolu=None, satir_sayisi=25, cikti=None):
+    """
+    Calls fonksiyon() under cProfile and returns its result. The raw stats
+    go to `dosya_yolu` (for snakeviz / pstats) and the top functions by
+    cumulative time are printed to `cikti` (stderr by default).
+    """
+    profil = cProfile.Profile()
+    try:
+        return profil.runcall(fonksiyon)
+    finally:
+        if dosya_yolu:
+            profil.dump_stats(dosya_yolu)
+        metin = io.StringIO()
+        pstats.Stats(profil, stream=metin).sort_stats("cumulative").print_stats(satir_sayisi)
+        print(metin.getvalue(), file=cikti or sys.stderr)
@@ -1,77 +1,75 @@
-import networkx as nx
+import hashlib
 import numpy as np
 import os
 
+from routing_table import RoutingTable
+from topology_loader import load_topology
+
 
 class NetworkManager:
-    def __init__(self, weights=(0.33, 0.33, 0.34)):
+    def __init__(self, weights=(0.33, 0.33, 0.34), data_folder=None, use_cache=True):
         # Robust path handling: Get the directory of the current script
         base_dir = os.path.dirname(os.path.abspath(__file__))
 
-        # Point to the sibling 'data' folder
-        self.data_folder = os.path.abspath(os.path.join(base_dir, '../data'))
+        # Point to the sibling 'data' folder unless told otherwise
+        if data_folder is None:
+            data_folder = os.path.join(base_dir, '../data')
+        self.data_folder = os.path.abspath(data_folder)
+        self.use_cache = use_cache
 
-        # Initialize Graph
-        self.G = nx.Graph()
+        # networkx view of the topology, built on first access of G
+        self._G = None
         self.demands = []
 
         # Optimization weights
         self.weights = weights
 
-        # Execute loaders
-        self.load_nodes()
-        self.load_edges()
+        # Bulk CSV/snapshot loader straight into the compiled arrays
+        self.load_topology()
         self.load_demands()
 
-    def load_nodes(self):
-        # Simplified path joining using the absolute data_folder path
-        file_path = os.path.join(self.data_folder, 'nodes.csv')
-
-        if not os.path.exists(file_path):
-            print(f"Error: {file_path} not found.")
-            return
-
-        with open(file_path, 'r', encoding='utf-8') as file:
-            next(file)  # Skip header
-
-            for line in file:
-                parts = line.strip().split(';')
-                if len(parts) < 3: continue
-
-                node_id = int(parts[0])
-                # Handle comma/dot decimal separator
-                proc_delay = float(parts[1].replace(',', '.'))
-                reliability = float(parts[2].replace(',', '.'))
-
-                self.G.add_node(node_id,
-                                processing_delay=proc_delay,
-                                reliability=reliability)
-
-    def load_edges(self):
-        # Updated filename to edges.csv
-        file_path = os.path.join(self.data_folder, 'edges.csv')
-
-        if not os.path.exists(file_path):
-            print(f"Error: {file_path} not found.")
-            return
-
-        with open(file_path, 'r', encoding='utf-8') as file:
-            next(file)  # Skip header
-
-            for line in file:
-                parts = line.strip().split(';')
-                if len(parts) < 5: continue
-
-                source_node = int(parts[0])
-                destination_node = int(parts[1])
-                bw = int(parts[2])
-                delay = int(parts[3])
-                rel = float(parts[4].replace(',', '.'))
+    @property
+    def G(self):
+        if self._G is None:
+            self._G = self.compiled.to_networkx()
+        return self._G
+
+    @G.setter
+    def G(self, graph):
+        self._G = graph
+
+    @classmethod
+    def from_compiled(cls, compiled, demands=None, weights=(0.33, 0.33, 0.34)):
+        """Builds a manager from an existing CompiledGraph without reading any CSV."""
+        manager = cls.__new__(cls)
+        manager.data_folder = None
+        manager.use_cache = False
+        manager.weights = weights
+        manager.demands = list(demands or [])
+        manager.compiled = compiled
+        manager.topology_hash = None
+        manager._G = None
+        return manager
+
+    def load_topology(self):
+        """Loads nodes.csv/edges.csv into self.compiled (snapshot cached)."""
+        self.compiled, self.topology_hash = load_topology(self.data_folder, self.use_cache)
+        self._G = None
+        return self.compiled
+
+    def reload(self):
+        """Re-reads the CSV topology and rebuilds the compiled arrays."""
+        self.demands = []
+        self.load_topology()
+        self.load_demands()
 
-                self.G.add_edge(source_node, destination_node,
-                                bandwidth=bw,
-                                link_delay=delay,
-                                reliability=rel)
+    def source_mtimes(self):
+        """Modification times of the topology CSVs (None if missing)."""
+        mtimes = {}
+        for name in ('nodes.csv', 'edges.csv', 'demand.csv'):
+            file_path = os.path.join(self.data_folder, name)
+            mtimes[name] = os.path.getmtime(file_path) if os.path.exists(file_path) else None
+        return mtimes
 
     def load_demands(self):
         # Updated filename to demand.csv
@@ -93,7 +91,71 @@ class NetworkManager:
                     'bw_demand': int(parts[2])
                 })
 
+    def calculate_fitness_batch(self, paths, weights=(0.33, 0.33, 0.34), bw_demand=0):
+        """
+        Vectorized calculate_fitness over a whole population.
+        Returns the same metric keys, each as an array aligned with `paths`.
+        """
+        return self.compiled.fitness_batch(paths, weights, bw_demand)
+
+    def _indices(self, *node_ids):
+        idx = self.compiled.to_index(list(node_ids))
+        for node_id, i in zip(node_ids, idx):
+            if i < 0:
+                raise KeyError(f"Unknown node: {node_id}")
+        return [int(i) for i in idx]
+
+    def _topology_changed(self, *change):
+        # Keeps cache keys distinct from the on-disk topology
+        text = f"{self.topology_hash}:{change}"
+        self.topology_hash = hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def update_edge(self, source, destination, bandwidth=None, link_delay=None, reliability=None):
+        """
+        Changes a link's attributes without reloading. Only the given
+        attributes change; optimizers can warm-start afterwards.
+        """
+        u, v = self._indices(source, destination)
+        self.compiled.update_edge(u, v, bandwidth, link_delay, reliability)
+        if self._G is not None:
+            for key, value in (('bandwidth', bandwidth), ('link_delay', link_delay),
+                               ('reliability', reliability)):
+                if value is not None:
+                    self._G[source][destination][key] = value
+        self._topology_changed('edge', source, destination, bandwidth, link_delay, reliability)
+
+    def remove_edge(self, source, destination):
+        """Removes a link without reloading."""
+        u, v = self._indices(source, destination)
+        self.compiled.remove_edge(u, v)
+        if self._G is not None:
+            self._G.remove_edge(source, destination)
+        self._topology_changed('remove', source, destination)
+
+    def update_node(self, node_id, processing_delay=None, reliability=None):
+        """Changes a node's attributes without reloading."""
+        (i,) = self._indices(node_id)
+        self.compiled.update_node(i, processing_delay, reliability)
+        if self._G is not None:
+            for key, value in (('processing_delay', processing_delay),
+                               ('reliability', reliability)):
+                if value is not None:
+                    self._G.nodes[node_id][key] = value
+        self._topology_changed('node', node_id, processing_delay, reliability)
+
+    def reserve_path(self, path, bw_demand):
+        """Reserves `bw_demand` on every link of `path` for later demands."""
+        self.compiled.reserve(path, bw_demand)
+
+    def reset_capacity(self):
+        """Drops all reservations."""
+        self.compiled.reset_residual()
+
     def calculate_fitness(self, path, weights=(0.33, 0.33, 0.34)):
+        """
+        Fitness and QoS metrics of a single path, scored on the compiled
+        arrays. Missing links or unknown nodes give an infinite fitness.
+        """
         if not path or len(path) < 2:
             return {
                 "fitness": float('inf'),
@@ -102,68 +164,75 @@ class NetworkManager:
                 "resource_cost": float('inf')
             }
 
-        w_delay, w_rel, w_res = weights
-
-        total_delay = 0
-        total_rel_cost = 0
-        total_res_cost = 0
-
-        # 1. Node Calculations
-        for node_id in path[1:-1]:
-            node_data = self.G.nodes[node_id]
-            total_delay += node_data.get('processing_delay', 0)
-
-            rel = node_data.get('reliability', 0.99)
-            total_rel_cost += -np.log(rel) if rel > 0 else 100
-
-        # 2. Edge Calculations
-        for i in range(len(path) - 1):
-            source_node = path[i]
-            destination_node = path[i + 1]
-
-            if not self.G.has_edge(source_node, destination_node):
-                return {
-                    "fitness": float('inf'),
-                    "total_delay": float('inf'),
-                    "total_reliability": 0.0,
-                    "resource_cost": float('inf')
-                }
-
-            edge_data = self.G[source_node][destination_node]
-
-            total_delay += edge_data.get('link_delay', 0)
-
-            link_rel = edge_data.get('reliability', 0.99)
-            total_rel_cost += -np.log(link_rel) if link_rel > 0 else 100
-
-            bw = edge_data.get('bandwidth', 1)
-            total_res_cost += (1000.0 / bw) if bw > 0 else 100
-
-        fitness = (w_delay * total_delay) + \
-                  (w_rel * total_rel_cost) + \
-                  (w_res * total_res_cost)
-
-        return {
-            "fitness": fitness,
-            "total_delay": total_delay,
-            "total_reliability": np.exp(-total_rel_cost),
-            "resource_cost": total_res_cost
-        }
+        metrics = self.compiled.fitness_batch([path], weights)
+        return {key: float(values[0]) for key, values in metrics.items()}
 
     def calculate_metrics(self, path):
         """Uses internal weights for metric calculation."""
         # Reuse the logic from calculate_fitness but use self.weights
         return self.calculate_fitness(path, self.weights)
 
-    def find_initial_paths(self, start, end, limit=5):
-        paths = []
-        try:
-            raw_paths_generator = nx.shortest_simple_paths(self.G, start, end)
-            for p in raw_paths_generator:
-                paths.append(p)
-                if len(paths) >= limit:
-                    break
-        except nx.NetworkXNoPath:
+    def solve_exact(self, start, end, weights=(0.33, 0.33, 0.34), bw_demand=0):
+        """
+        Exact optimum of calculate_fitness between two nodes. Every objective
+        term is additive per hop, so this is a Dijkstra over the combined cost.
+        Returns the calculate_fitness metrics plus the optimal "path".
+        """
+        cg = self.compiled
+        start_idx, end_idx = cg.to_index([start, end])
+        path = None
+        if start_idx >= 0 and end_idx >= 0 and start_idx != end_idx:
+            _, next_hop = cg.shortest_path_tree(end_idx, weights, bw_demand, stop_at=start_idx)
+            path = cg.follow_tree(next_hop, start_idx) if next_hop[start_idx] >= 0 else None
+
+        result = {key: float(value[0]) for key, value in
+                  cg.fitness_batch([path], weights, bw_demand).items()}
+        result["path"] = path
+        return result
+
+    def pareto_paths(self, start, end, bw_demand=0, max_labels=50):
+        """
+        Pareto-optimal paths for (delay, reliability, resource cost) between two
+        nodes, found by label setting. Sorted by delay.
+        """
+        cg = self.compiled
+        start_idx, end_idx = cg.to_index([start, end])
+        if start_idx < 0 or end_idx < 0 or start_idx == end_idx:
             return []
 
-        return paths
\ No newline at end of file
+        front = []
+        for (delay, rel_cost, res_cost), path in cg.pareto_labels(start_idx, end_idx,
+                                                                  bw_demand, max_labels):
+            front.append({
+                "path": path,
+                "total_delay": delay,
+                "total_reliability": float(np.exp(-rel_cost)),
+                "resource_cost": res_cost
+            })
+        front.sort(key=lambda r: r["total_delay"])
+        return front
+
+    def routing_table(self, weights=(0.33, 0.33, 0.34), bw_demand=0, workers=None, folder=None):
+        """
+        Best path between every pair of nodes under calculate_fitness, as a
+        memory-mapped RoutingTable. Stored under <data>/.cache/routing and
+        reused until the topology, weights or reservations change.
+        """
+        return RoutingTable.compute(self, weights, bw_demand, workers, folder)
+
+    @staticmethod
+    def optimality_gap(fitness, optimum):
+        """Relative distance (%) of a heuristic fitness from the exact optimum."""
+        if optimum is None or not np.isfinite(optimum) or not np.isfinite(fitness):
+            return float('inf')
+        if optimum == 0:
+            return 0.0 if fitness == 0 else float('inf')
+        return 100.0 * (fitness - optimum) / optimum
+
+    def find_initial_paths(self, start, end, limit=5, bw_demand=0):
+        """Up to `limit` shortest loopless paths by hop count (Yen, no networkx)."""
+        cg = self.compiled
+        start_idx, end_idx = cg.to_index([start, end])
+        if start_idx < 0 or end_idx < 0:
+            return []
+        return cg.k_shortest_paths(int(start_idx), int(end_idx), limit, bw_demand)
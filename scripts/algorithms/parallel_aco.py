@@ -0,0 +1,230 @@
+"""
+Multi-colony ACO over a process pool.
+
+Every colony is a KarincaKolonisiOptimizasyonu with its own seeded RNG and
+its own pheromone row. The rows live in one shared-memory block of shape
+(koloni_sayisi, edge_count), so workers update them in place and nothing
+large is pickled between epochs.
+
+After every `paylasim_araligi` iterations:
+  - each row is pulled towards the colony mean by `paylasim_orani`;
+  - the global best path is written into a second shared block, and every
+    colony deposits it on its own row before the next epoch.
+
+Each epoch task carries the colony's RNG state and MAX-MIN bounds, so the
+result only depends on the seeds, never on which worker ran which colony.
+
+    python parallel_aco.py --koloniler 4 --workers 4 --tohum 42
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from aco import KarincaKolonisiOptimizasyonu, csvden_parametreleri_oku
+from network_manager import NetworkManager
+from seeding import alt_tohumlar, tohum_oku, yeni_tohum
+from stopping import DurmaKosulu, feromon_entropisi
+
+# Per-worker state, set by _worker_init
+_network = None
+_ayar = None
+_bloklar = None
+_koloniler = {}
+
+
+def _worker_init(compiled, weights, ayar, feromon_adi, yol_adi):
+    global _network, _ayar, _bloklar, _koloniler
+    _network = NetworkManager.from_compiled(compiled, weights=weights)
+    _ayar = ayar
+    # Keep the SharedMemory objects alive as long as the views are used
+    _bloklar = (shared_memory.SharedMemory(name=feromon_adi),
+                shared_memory.SharedMemory(name=yol_adi))
+    _koloniler = {}
+
+
+def _paylasilan_diziler(bloklar, koloni_sayisi, edge_count, node_count):
+    feromon = np.ndarray((koloni_sayisi, edge_count), dtype=np.float64, buffer=bloklar[0].buf)
+    en_iyi_yol = np.ndarray((node_count + 1,), dtype=np.int64, buffer=bloklar[1].buf)
+    return feromon, en_iyi_yol
+
+
+def _koloni(koloni_no):
+    """The worker's colony object, with its pheromone bound to the shared row."""
+    aco = _koloniler.get(koloni_no)
+    if aco is None:
+        aco = KarincaKolonisiOptimizasyonu(_network, _ayar["agirliklar"], **_ayar["aco"])
+        _koloniler[koloni_no] = aco
+    feromon, _ = _paylasilan_diziler(_bloklar, _ayar["koloni_sayisi"],
+                                     _network.compiled.edge_count, _network.compiled.node_count)
+    aco.feromon = feromon[koloni_no]
+    return aco
+
+
+def _worker_epoch(gorev):
+    koloni_no, (rng_durumu, sinir_durumu), tohum, iterasyon, en_iyi_fitness = gorev
+    aco = _koloni(koloni_no)
+    cg = _network.compiled
+    if rng_durumu is None:
+        aco.rng = np.random.default_rng(tohum)
+        aco.sinirlari_sifirla()
+    else:
+        aco.rng.bit_generator.state = rng_durumu
+        aco.sinir_durumu_yukle(sinir_durumu)
+
+    # Elitist deposit of the best path any colony has found so far
+    _, paylasilan_yol = _paylasilan_diziler(_bloklar, _ayar["koloni_sayisi"],
+                                            cg.edge_count, cg.node_count)
+    uzunluk = int((paylasilan_yol >= 0).sum())
+    if uzunluk > 1:
+        aco.feromon_birak([(cg.node_ids[paylasilan_yol[:uzunluk]].tolist(), en_iyi_fitness)])
+
+    yol, fitness = aco.iterasyonlar(_ayar["kaynak"], _ayar["hedef"], iterasyon)
+    return koloni_no, (aco.rng.bit_generator.state, aco.sinir_durumu()), yol, fitness
+
+
+class CokluKoloni:
+    """
+    Same interface as KarincaKolonisiOptimizasyonu (calistir -> (path, fitness))
+    over `koloni_sayisi` colonies. The remaining keyword arguments go to every
+    colony; karinca_sayisi and iterasyon_sayisi are per colony. After a run,
+    `rapor` holds each colony's seed and best fitness per epoch and
+    `global_gecmis` the global best per epoch.
+    """
+
+    def __init__(self, network, agirliklar, koloni_sayisi=4, paylasim_araligi=10,
+                 paylasim_orani=0.5, workers=None, tohum=None, iterasyon_sayisi=50,
+                 baslangic_yollari=None, durma=None, **aco_parametreleri):
+        self.network = network
+        self.agirliklar = tuple(agirliklar)
+        self.koloni_sayisi = max(1, int(koloni_sayisi))
+        self.paylasim_araligi = max(1, int(paylasim_araligi))
+        self.paylasim_orani = float(paylasim_orani)
+        self.workers = workers
+        self.tohum = tohum
+        self.iterasyon_sayisi = iterasyon_sayisi
+        self.baslangic_yollari = baslangic_yollari or []
+        self.aco_parametreleri = aco_parametreleri
+        # Checked after every epoch on the global best and mean colony entropy
+        self.durma = durma or DurmaKosulu()
+        self.rapor = []
+        self.global_gecmis = []
+
+    def _baslangic_feromonu(self):
+        """Initial pheromone row, including the deposit of baslangic_yollari."""
+        aco = KarincaKolonisiOptimizasyonu(self.network, self.agirliklar,
+                                           baslangic_yollari=self.baslangic_yollari,
+                                           **self.aco_parametreleri)
+        aco.hazirla()
+        return aco.feromon
+
+    def calistir(self, kaynak, hedef):
+        cg = self.network.compiled
+        k, e, n = self.koloni_sayisi, cg.edge_count, cg.node_count
+        tohumlar = alt_tohumlar(self.tohum, k)
+        self.rapor = [{"koloni": i, "tohum": tohumlar[i], "en_iyi_fitness": float("inf"),
+                       "gecmis": []} for i in range(k)]
+        self.global_gecmis = []
+        en_iyi_yol, en_iyi_fitness = None, float("inf")
+
+        ayar = {"kaynak": int(kaynak), "hedef": int(hedef), "agirliklar": self.agirliklar,
+                "koloni_sayisi": k, "aco": self.aco_parametreleri}
+        bloklar = (shared_memory.SharedMemory(create=True, size=max(1, k * e) * 8),
+                   shared_memory.SharedMemory(create=True, size=(n + 1) * 8))
+        try:
+            feromon, paylasilan_yol = _paylasilan_diziler(bloklar, k, e, n)
+            feromon[:] = self._baslangic_feromonu()
+            paylasilan_yol[:] = -1
+            durumlar = [(None, None)] * k
+
+            self.durma.baslat()
+            workers = max(1, min(self.workers or os.cpu_count() or 1, k))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init,
+                                     initargs=(cg, self.network.weights, ayar,
+                                               bloklar[0].name, bloklar[1].name)) as executor:
+                kalan = self.iterasyon_sayisi
+                while kalan > 0:
+                    iterasyon = min(self.paylasim_araligi, kalan)
+                    kalan -= iterasyon
+                    gorevler = [(i, durumlar[i], tohumlar[i], iterasyon, en_iyi_fitness)
+                                for i in range(k)]
+                    for koloni_no, durum, yol, fitness in executor.map(_worker_epoch, gorevler):
+                        durumlar[koloni_no] = durum
+                        kayit = self.rapor[koloni_no]
+                        kayit["en_iyi_fitness"] = min(kayit["en_iyi_fitness"], fitness)
+                        kayit["gecmis"].append(kayit["en_iyi_fitness"])
+                        if fitness < en_iyi_fitness:
+                            en_iyi_yol, en_iyi_fitness = yol, fitness
+                    self.global_gecmis.append(en_iyi_fitness)
+                    entropi = feromon_entropisi(feromon) if self.durma.min_entropi else None
+                    if self.durma.kontrol(self.iterasyon_sayisi - kalan, en_iyi_fitness,
+                                          entropi=entropi):
+                        break
+
+                    # Pull every colony's pheromone towards the common mean
+                    if k > 1 and self.paylasim_orani > 0:
+                        ortalama = feromon.mean(axis=0)
+                        feromon *= (1.0 - self.paylasim_orani)
+                        feromon += self.paylasim_orani * ortalama
+                    if en_iyi_yol:
+                        paylasilan_yol[:] = -1
+                        paylasilan_yol[:len(en_iyi_yol)] = cg.to_index(en_iyi_yol)
+            self.durma.tamamla()
+            del feromon, paylasilan_yol
+        finally:
+            for blok in bloklar:
+                blok.close()
+                blok.unlink()
+
+        return en_iyi_yol, en_iyi_fitness
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-colony ACO")
+    parser.add_argument("--koloniler", type=int, default=4, help="Number of colonies")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--paylasim-araligi", type=int, default=10,
+                        help="Iterations between pheromone exchanges")
+    parser.add_argument("--paylasim-orani", type=float, default=0.5,
+                        help="How far each colony moves towards the mean pheromone (0-1)")
+    parser.add_argument("--tohum", type=int, default=None,
+                        help="Base seed (default: tohum from the input CSV, else a fresh one)")
+    args = parser.parse_args()
+
+    p = csvden_parametreleri_oku(r"../data/aco_input.csv")
+    agirliklar = (float(p["agirlik_delay"]), float(p["agirlik_reliability"]),
+                  float(p["agirlik_cost"]))
+
+    tohum = args.tohum if args.tohum is not None else tohum_oku(p)
+    tohum = yeni_tohum() if tohum is None else tohum
+
+    network = NetworkManager()
+    model = CokluKoloni(network, agirliklar, args.koloniler, args.paylasim_araligi,
+                        args.paylasim_orani, args.workers, tohum,
+                        karinca_sayisi=int(p["karinca_sayisi"]),
+                        iterasyon_sayisi=int(p["iterasyon"]),
+                        alfa=float(p["alfa"]), beta=float(p["beta"]),
+                        buharlasma_orani=float(p["buharlasma"]),
+                        q_degeri=float(p["q_degeri"]),
+                        bw_talep=float(p.get("bw_talep", 0)),
+                        aday_sayisi=int(float(p.get("aday_sayisi", 0))),
+                        maks_min=bool(int(float(p.get("maks_min", 0)))),
+                        durma=DurmaKosulu.parametrelerden(p))
+    start_time = time.time()
+    yol, fitness = model.calistir(int(p["kaynak"]), int(p["hedef"]))
+    sure = time.time() - start_time
+
+    for kayit in model.rapor:
+        print(f"Koloni {kayit['koloni']}: en iyi fitness {kayit['en_iyi_fitness']:.6f}")
+    print("Global yakinsama: " + ", ".join(f"{f:.4f}" for f in model.global_gecmis))
+    print(f"En iyi yol: {' → '.join(map(str, yol)) if yol else 'BULUNAMADI'}")
+    print(f"Fitness: {fitness:.6f} | Sure (sn): {sure:.3f}")
+    print(f"Durma: {model.durma.durma_nedeni} | Iterasyon: {model.durma.durma_iterasyonu}")
+    print(f"Tohum: {tohum}")
+
+
+if __name__ == "__main__":
+    main()
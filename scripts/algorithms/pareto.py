@@ -0,0 +1,61 @@
+"""
+Non-dominated sorting and crowding distance (NSGA-II) over objective
+matrices of shape (n, m), all objectives minimized. Both work on whole
+columns at once; there is no per-individual Python loop.
+"""
+import numpy as np
+
+
+def baskinlik_matrisi(amaclar):
+    """D[i, j] is True when row i dominates row j."""
+    a = np.asarray(amaclar, dtype=np.float64)
+    kucuk_esit = (a[:, None, :] <= a[None, :, :]).all(axis=2)
+    kucuk = (a[:, None, :] < a[None, :, :]).any(axis=2)
+    return kucuk_esit & kucuk
+
+
+def baskin_olmayan_siralama(amaclar):
+    """Front number of every row: 0 for the non-dominated set, 1 for the next, ..."""
+    baskin = baskinlik_matrisi(amaclar)
+    n = baskin.shape[0]
+    sira = np.full(n, -1, dtype=np.int64)
+    # How many not yet ranked rows dominate each row
+    sayac = baskin.sum(axis=0)
+    kalan = np.ones(n, dtype=bool)
+    cephe_no = 0
+    while kalan.any():
+        cephe = kalan & (sayac == 0)
+        sira[cephe] = cephe_no
+        kalan &= ~cephe
+        sayac -= baskin[cephe].sum(axis=0)
+        cephe_no += 1
+    return sira
+
+
+def kalabalik_mesafesi(amaclar, sira):
+    """
+    Crowding distance of every row within its own front. Boundary rows of a
+    front get inf, so they are always kept.
+    """
+    a = np.asarray(amaclar, dtype=np.float64)
+    n, m = a.shape
+    mesafe = np.zeros(n)
+    if n == 0:
+        return mesafe
+    for j in range(m):
+        # Sorting by (front, objective) puts every front in one contiguous block
+        duzen = np.lexsort((a[:, j], sira))
+        deger = a[duzen, j]
+        cephe = sira[duzen]
+        sinir = np.r_[True, cephe[1:] != cephe[:-1], True]
+        bas, son = np.flatnonzero(sinir[:-1]), np.flatnonzero(sinir[1:])
+        # Sorted within each front, so its range is last minus first
+        aralik = np.repeat(deger[son] - deger[bas], son - bas + 1)
+        katki = np.full(n, np.inf)
+        ic = ~(sinir[:-1] | sinir[1:])
+        ic_idx = np.flatnonzero(ic)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            katki[ic_idx] = np.where(aralik[ic_idx] > 0,
+                                     (deger[ic_idx + 1] - deger[ic_idx - 1]) / aralik[ic_idx], 0.0)
+        mesafe[duzen] += katki
+    return mesafe
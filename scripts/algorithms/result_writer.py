@@ -0,0 +1,146 @@
+"""
+One result format for every solver output.
+
+A result is the dict solver.solve() returns: endpoints, path, metrics,
+solve time, parameters, seed and stop reason. build_result() makes one
+from any run, so aco.py, genetics.py, the CLI, the daemon and batch runs all
+report the same fields.
+
+write_result() stores one result as a JSON document and write_results()
+many as NDJSON, one line per demand. Every file goes through a temp file in
+the same folder and os.replace, so a reader sees the old file or the new
+one, never half of it. inf / nan (no path) become null.
+
+write_legacy_csv() keeps the <algo>_output.csv / <algo>_path.csv pair the
+Flutter UI reads, written the same way from the same result.
+"""
+import csv
+import io
+import json
+import math
+import os
+import tempfile
+
+PATH_SEPARATOR = " → "
+
+
+def json_safe(value):
+    """Replaces inf/nan (not valid JSON) with None, recursively."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(v) for v in value]
+    return value
+
+
+def build_result(network, algo, source, target, weights, path, seconds, bw_demand=0,
+                 params=None, seed=None, stop=None, optimum=None):
+    """
+    The solve() dict of one run. `stop` is DurmaKosulu.ozet(); `optimum`
+    the solve_exact() result, computed here if not given.
+    """
+    if optimum is None:
+        optimum = network.solve_exact(int(source), int(target), weights, bw_demand)
+    metrics = network.calculate_fitness(path, weights)
+    return {
+        "algo": algo,
+        "kaynak": int(source),
+        "hedef": int(target),
+        "bw_talep": bw_demand,
+        "yol": [int(n) for n in path] if path else None,
+        "fitness": float(metrics["fitness"]),
+        "total_delay": float(metrics["total_delay"]),
+        "total_reliability": float(metrics["total_reliability"]),
+        "resource_cost": float(metrics["resource_cost"]),
+        "sure": seconds,
+        "optimum_fitness": optimum["fitness"],
+        "optimallik_farki": network.optimality_gap(float(metrics["fitness"]), optimum["fitness"]),
+        "parametreler": dict(params or {}),
+        "tohum": seed,
+        **(stop or {"durma_nedeni": None, "durma_iterasyonu": None}),
+    }
+
+
+def atomic_write(path, text):
+    """Writes `text` to `path` through a temp file and a rename; returns the absolute path."""
+    path = os.path.abspath(path)
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp',
+                                     dir=folder)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return path
+
+
+def write_result(path, result):
+    """One result (or any JSON-able report) as an indented JSON document."""
+    return atomic_write(path, json.dumps(json_safe(result), ensure_ascii=False, indent=2) + "\n")
+
+
+def write_results(path, results):
+    """Many results as NDJSON in a single write."""
+    return atomic_write(path, "".join(json.dumps(json_safe(r), ensure_ascii=False) + "\n"
+                                      for r in results))
+
+
+def read_results(path):
+    """The results of a write_result / write_results file, as a list."""
+    with open(path, encoding='utf-8') as file:
+        text = file.read()
+    try:
+        document = json.loads(text)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return document if isinstance(document, list) else [document]
+
+
+def _csv_text(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _rounded(value, digits, scale=1.0):
+    return round(value * scale, digits) if value is not None and math.isfinite(value) else value
+
+
+def write_legacy_csv(result, output_path, path_path):
+    """
+    The Alan/Deger table and the step/node_id path file of one result,
+    in the layout the Flutter UI parses. The path file is removed when
+    there is no path, so a stale route is never shown.
+    """
+    yol = result.get("yol")
+    rows = [
+        ["Alan", "Deger"],
+        ["Kaynak", result["kaynak"]],
+        ["Hedef", result["hedef"]],
+        ["Yol", PATH_SEPARATOR.join(map(str, yol)) if yol else "BULUNAMADI"],
+        ["Fitness", _rounded(result["fitness"], 6)],
+        ["Gecikme (ms)", _rounded(result["total_delay"], 4)],
+        ["Guvenilirlik (%)", _rounded(result["total_reliability"], 2, 100)],
+        ["Kaynak Maliyeti", _rounded(result["resource_cost"], 6)],
+        ["Sure (sn)", _rounded(result["sure"], 4)],
+        ["Optimum Fitness", _rounded(result["optimum_fitness"], 6)],
+        ["Optimallik Farki (%)", _rounded(result["optimallik_farki"], 4)],
+        ["Durma Nedeni", result.get("durma_nedeni")],
+        ["Durma Iterasyonu", result.get("durma_iterasyonu")],
+        ["Tohum", result.get("tohum")],
+        ["Rota Onbellegi", "isabet" if result.get("onbellek") else "yok"],
+    ]
+    atomic_write(output_path, _csv_text(rows))
+    if yol:
+        atomic_write(path_path, _csv_text([["step", "node_id"]] + list(enumerate(yol))))
+    elif os.path.exists(path_path):
+        os.remove(path_path)
@@ -0,0 +1,131 @@
+"""
+Persistent cache of solved routes.
+
+A result is stored under a SHA-1 key of the topology hash, the endpoints,
+the weights, the bandwidth demand, the algorithm and its parameters. An
+edited nodes.csv / edges.csv (or an in-memory update_edge) changes the
+topology hash, so old entries simply stop matching and age out. With a
+bandwidth demand the residual capacities are part of the key too, since
+reservations change the answer. RESULT_FORMAT is part of the key as well,
+so entries written in an older result layout stop matching the same way.
+
+Entries live in an LRU dict in memory and in <data>/.cache/routes.sqlite,
+both bounded in size (least recently used entries go first).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+# Version of the stored result dict (result_writer.build_result); bump on changes
+RESULT_FORMAT = 2
+
+
+def route_key(network, algo, source, target, weights, bw_demand=0, params=None):
+    """Cache key of one solve, or None if the topology has no content hash."""
+    if network.topology_hash is None:
+        return None
+    residual = None
+    if bw_demand > 0:
+        residual = hashlib.sha1(network.compiled.residual_bandwidth.tobytes()).hexdigest()
+    text = json.dumps({
+        'format': RESULT_FORMAT,
+        'topology': network.topology_hash,
+        'residual': residual,
+        'algo': algo,
+        'source': int(source),
+        'target': int(target),
+        'weights': [float(w) for w in weights],
+        'bw_demand': float(bw_demand),
+        'params': {str(k): str(v) for k, v in (params or {}).items()},
+    }, sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class RouteCache:
+    def __init__(self, path=None, memory_entries=256, disk_entries=10000):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.connection = None
+        if path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                self.connection = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+                self.connection.execute(
+                    'CREATE TABLE IF NOT EXISTS routes (key TEXT PRIMARY KEY, '
+                    'topology TEXT, result TEXT, last_used REAL)')
+                self.connection.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: route cache on disk disabled: {e}")
+                self.connection = None
+
+    @classmethod
+    def for_folder(cls, data_folder, **kwargs):
+        """The cache file next to the topology snapshot of `data_folder`."""
+        return cls(os.path.join(data_folder, '.cache', 'routes.sqlite'), **kwargs)
+
+    def _remember(self, key, result):
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, key):
+        """The stored result for `key` (a dict), or None."""
+        if key is None:
+            return None
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return dict(self.memory[key])
+        if self.connection is not None:
+            try:
+                row = self.connection.execute(
+                    'SELECT result FROM routes WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    self.connection.execute('UPDATE routes SET last_used = ? WHERE key = ?',
+                                            (time.time(), key))
+                    self.connection.commit()
+                    result = json.loads(row[0])
+                    self._remember(key, result)
+                    self.hits += 1
+                    return dict(result)
+            except sqlite3.Error as e:
+                print(f"Warning: route cache read failed: {e}")
+        self.misses += 1
+        return None
+
+    def put(self, key, topology, result):
+        """Stores `result` (JSON-serializable) under `key`."""
+        if key is None:
+            return
+        self._remember(key, dict(result))
+        if self.connection is None:
+            return
+        try:
+            with self.connection:
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO routes VALUES (?, ?, ?, ?)',
+                    (key, topology, json.dumps(result), time.time()))
+                self.connection.execute(
+                    'DELETE FROM routes WHERE key IN (SELECT key FROM routes '
+                    'ORDER BY last_used DESC LIMIT -1 OFFSET ?)', (self.disk_entries,))
+        except sqlite3.Error as e:
+            print(f"Warning: route cache write failed: {e}")
+
+    def clear(self):
+        self.memory.clear()
+        if self.connection is not None:
+            with self.connection:
+                self.connection.execute('DELETE FROM routes')
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,261 @@
+"""
+All-pairs routing table under the weighted calculate_fitness cost.
+
+One Dijkstra tree per destination (CompiledGraph.shortest_path_tree) gives
+the optimal route from every node to it. Destinations are sharded over a
+ProcessPoolExecutor; every worker writes its rows straight into .npy files
+opened as memory maps, so nothing large is pickled back.
+
+The table lives in <data>/.cache/routing/<key>/, keyed by the topology hash,
+the weights and the bandwidth demand. Rows are destinations:
+
+    cost[t, s], delay[t, s], reliability[t, s]   metrics of the best s -> t path
+    next_hop[t, s]                               next node index from s towards t
+
+so a lookup reads one row and never recomputes anything.
+
+    cd scripts && python -m algorithms table --kaynak 0 --hedef 249
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+ARRAYS = {'cost': np.float32, 'delay': np.float32, 'reliability': np.float32,
+          'next_hop': np.int32}
+# Tables kept per data folder; n x n arrays get large, oldest used go first
+KEEP_TABLES = 4
+
+# Per-worker state, set by _worker_init
+_compiled = None
+_settings = None
+_arrays = None
+
+
+def table_key(network, weights, bw_demand=0):
+    """Folder name of a table, or None if the topology has no content hash."""
+    if network.topology_hash is None:
+        return None
+    residual = None
+    if bw_demand > 0:
+        residual = hashlib.sha1(network.compiled.residual_bandwidth.tobytes()).hexdigest()
+    text = json.dumps({
+        'topology': network.topology_hash,
+        'residual': residual,
+        'weights': [float(w) for w in weights],
+        'bw_demand': float(bw_demand),
+    }, sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _tree_totals(cg, root, next_hop):
+    """
+    Delay and reliability cost of every node's path to `root` along a
+    Dijkstra tree, summed by pointer jumping (log n vectorized passes).
+    Counts the same terms as fitness_batch: every edge plus intermediate nodes.
+    """
+    n = cg.node_count
+    nodes = np.arange(n)
+    reached = next_hop >= 0
+    parent = np.where(reached, next_hop, nodes)
+    delay = np.zeros(n)
+    rel_cost = np.zeros(n)
+    edges = cg.slot_edge[cg.find_slots(nodes[reached], parent[reached])]
+    inner = parent[reached] != root
+    delay[reached] = cg.edge_delay[edges] + \
+        np.where(inner, cg.node_processing_delay[parent[reached]], 0.0)
+    rel_cost[reached] = cg.edge_rel_cost[edges] + \
+        np.where(inner, cg.node_rel_cost[parent[reached]], 0.0)
+
+    # Every pass doubles the distance covered; the root points to itself
+    jump = parent
+    for _ in range(max(n - 1, 1).bit_length()):
+        delay += delay[jump]
+        rel_cost += rel_cost[jump]
+        jump = jump[jump]
+    return delay, rel_cost
+
+
+def _fill_rows(cg, weights, bw_demand, arrays, roots):
+    for t in roots:
+        dist, next_hop = cg.shortest_path_tree(int(t), weights, bw_demand)
+        delay, rel_cost = _tree_totals(cg, t, next_hop)
+        unreachable = ~np.isfinite(dist)
+        unreachable[t] = True
+        delay[unreachable] = np.inf
+        arrays['cost'][t] = np.where(unreachable, np.inf, dist)
+        arrays['delay'][t] = delay
+        arrays['reliability'][t] = np.where(unreachable, 0.0, np.exp(-rel_cost))
+        arrays['next_hop'][t] = next_hop
+    return len(roots)
+
+
+def _open_arrays(folder, mode='r'):
+    return {name: np.load(os.path.join(folder, name + '.npy'), mmap_mode=mode)
+            for name in ARRAYS}
+
+
+def _worker_init(compiled, weights, bw_demand, folder):
+    global _compiled, _settings, _arrays
+    _compiled = compiled
+    _settings = (tuple(weights), bw_demand)
+    _arrays = _open_arrays(folder, 'r+')
+
+
+def _worker_rows(roots):
+    written = _fill_rows(_compiled, *_settings, _arrays, roots)
+    for array in _arrays.values():
+        array.flush()
+    return written
+
+
+def build_table(cg, folder, weights=(0.33, 0.33, 0.34), bw_demand=0, workers=None):
+    """
+    Computes every row into `folder` (created if missing).
+    Contiguous blocks of destinations go to `workers` processes.
+    """
+    n = cg.node_count
+    os.makedirs(folder, exist_ok=True)
+    for name, dtype in ARRAYS.items():
+        np.lib.format.open_memmap(os.path.join(folder, name + '.npy'), mode='w+',
+                                  dtype=dtype, shape=(n, n)).flush()
+    np.save(os.path.join(folder, 'node_ids.npy'), cg.node_ids)
+
+    workers = max(1, min(workers or os.cpu_count() or 1, n))
+    if workers == 1:
+        arrays = _open_arrays(folder, 'r+')
+        _fill_rows(cg, tuple(weights), bw_demand, arrays, range(n))
+        for array in arrays.values():
+            array.flush()
+        return
+
+    blocks = np.array_split(np.arange(n), workers * 4)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init,
+                             initargs=(cg, weights, bw_demand, folder)) as executor:
+        list(executor.map(_worker_rows, [b.tolist() for b in blocks if len(b)]))
+
+
+def _replace_files(staging, folder):
+    """Moves a built table's files into `folder`; meta.json goes last, other files stay."""
+    os.makedirs(folder, exist_ok=True)
+    meta = os.path.join(folder, 'meta.json')
+    if os.path.exists(meta):
+        os.remove(meta)
+    for name in [name + '.npy' for name in ARRAYS] + ['node_ids.npy', 'meta.json']:
+        os.replace(os.path.join(staging, name), os.path.join(folder, name))
+
+
+def _prune(parent, keep):
+    """Deletes all but the `keep` most recently used tables under `parent`."""
+    tables = []
+    for name in os.listdir(parent):
+        meta = os.path.join(parent, name, 'meta.json')
+        if os.path.exists(meta):
+            tables.append((os.path.getmtime(meta), os.path.join(parent, name)))
+    for _, folder in sorted(tables, reverse=True)[keep:]:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+class RoutingTable:
+    """Read-only view of a stored table; opening it maps the files, it reads nothing."""
+
+    def __init__(self, folder):
+        self.folder = folder
+        with open(os.path.join(folder, 'meta.json'), encoding='utf-8') as file:
+            self.meta = json.load(file)
+        self.node_ids = np.load(os.path.join(folder, 'node_ids.npy'))
+        arrays = _open_arrays(folder)
+        self.cost = arrays['cost']
+        self.delay = arrays['delay']
+        self.reliability = arrays['reliability']
+        self.next_hop = arrays['next_hop']
+
+    @classmethod
+    def compute(cls, network, weights=(0.33, 0.33, 0.34), bw_demand=0, workers=None,
+                folder=None):
+        """
+        The table of `network`, built unless a matching one is stored.
+        Without a topology hash (e.g. from_compiled) it goes to a temporary folder.
+        """
+        key = table_key(network, weights, bw_demand)
+        if folder is None and (key is None or network.data_folder is None):
+            folder = tempfile.mkdtemp(prefix='routing_table_')
+            build_table(network.compiled, folder, weights, bw_demand, workers)
+            cls._write_meta(folder, network, key, weights, bw_demand)
+            return cls(folder)
+
+        # Only folders under <data>/.cache/routing are ours to delete; in a
+        # folder given by the caller just the table files are replaced
+        shared = folder is None
+        folder = folder or os.path.join(network.data_folder, '.cache', 'routing', key)
+        meta = os.path.join(folder, 'meta.json')
+        if os.path.exists(meta):
+            table = cls(folder)
+            if key is not None and table.meta.get('key') == key:
+                os.utime(meta)
+                return table
+            if shared:
+                shutil.rmtree(folder)
+
+        # Built next to its final place and renamed, so readers never see half a table
+        parent = os.path.dirname(os.path.abspath(folder))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.building_', dir=parent)
+        try:
+            build_table(network.compiled, staging, weights, bw_demand, workers)
+            cls._write_meta(staging, network, key, weights, bw_demand)
+            if shared:
+                os.replace(staging, folder)
+            else:
+                _replace_files(staging, folder)
+        except OSError:
+            # Another process finished the same table first
+            if not os.path.exists(os.path.join(folder, 'meta.json')):
+                raise
+        finally:
+            if os.path.exists(staging):
+                shutil.rmtree(staging)
+        if shared:
+            _prune(parent, KEEP_TABLES)
+        return cls(folder)
+
+    @staticmethod
+    def _write_meta(folder, network, key, weights, bw_demand):
+        with open(os.path.join(folder, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump({'key': key, 'topology': network.topology_hash,
+                       'weights': [float(w) for w in weights],
+                       'bw_demand': float(bw_demand),
+                       'node_count': int(network.compiled.node_count)}, file)
+
+    def _index(self, node_id):
+        i = int(np.searchsorted(self.node_ids, node_id))
+        if i >= len(self.node_ids) or self.node_ids[i] != node_id:
+            raise KeyError(f"Unknown node: {node_id}")
+        return i
+
+    def path(self, source, target):
+        """Node ids of the stored best path, or None if target is unreachable."""
+        s, t = self._index(source), self._index(target)
+        if s == t or not np.isfinite(self.cost[t, s]):
+            return None
+        row = self.next_hop[t]
+        path = [s]
+        while path[-1] != t:
+            path.append(int(row[path[-1]]))
+            if path[-1] < 0 or len(path) > len(self.node_ids):
+                return None
+        return self.node_ids[path].tolist()
+
+    def lookup(self, source, target):
+        """calculate_fitness-style metrics of one pair plus its "path"."""
+        s, t = self._index(source), self._index(target)
+        return {
+            "fitness": float(self.cost[t, s]),
+            "total_delay": float(self.delay[t, s]),
+            "total_reliability": float(self.reliability[t, s]),
+            "path": self.path(source, target),
+        }
@@ -0,0 +1,85 @@
+"""
+Seeds and random streams shared by the optimizers.
+
+Every run draws from one numpy Generator built from its `tohum`, never from
+the global `random` / `np.random` state. Parallel parts (islands, colonies)
+get child seeds from SeedSequence.spawn, so any sub-stream can be derived
+again from the run seed alone.
+"""
+import bisect
+import itertools
+
+import numpy as np
+
+TAMPON_BOYUTU = 1024
+
+
+def tohum_oku(params):
+    """The `tohum` of an input CSV / JSON dict as an int, or None if it is missing or empty."""
+    deger = (params or {}).get("tohum")
+    return None if deger in (None, "") else int(float(deger))
+
+
+def yeni_tohum():
+    """A fresh seed from OS entropy, for runs that were started without one."""
+    return int(np.random.SeedSequence().generate_state(1)[0])
+
+
+def alt_tohumlar(tohum, sayi):
+    """`sayi` independent child seeds of `tohum` (one per island, colony, ...)."""
+    return [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(tohum).spawn(sayi)]
+
+
+class Akis:
+    """
+    Scalar draws (random, randrange, choice, sample, choices) over a numpy
+    Generator. A Generator call costs about a microsecond, so uniforms are
+    drawn in blocks of TAMPON_BOYUTU and handed out one by one.
+    """
+
+    def __init__(self, tohum=None):
+        # default_rng returns a Generator unchanged, so a caller can pass its own
+        self.generator = np.random.default_rng(tohum)
+        self._tampon = []
+
+    @property
+    def durum(self):
+        """Generator state plus the unused buffer; restoring it continues the same stream."""
+        return self.generator.bit_generator.state, list(self._tampon)
+
+    @durum.setter
+    def durum(self, deger):
+        self.generator.bit_generator.state, tampon = deger
+        self._tampon = list(tampon)
+
+    def random(self):
+        if not self._tampon:
+            self._tampon = self.generator.random(TAMPON_BOYUTU).tolist()
+        return self._tampon.pop()
+
+    def randrange(self, n):
+        if not self._tampon:
+            self._tampon = self.generator.random(TAMPON_BOYUTU).tolist()
+        i = int(self._tampon.pop() * n)
+        return i if i < n else n - 1
+
+    def randint(self, a, b):
+        return a + self.randrange(b - a + 1)
+
+    def choice(self, dizi):
+        return dizi[self.randrange(len(dizi))]
+
+    def sample(self, dizi, k):
+        if k > len(dizi):
+            raise ValueError("Sample larger than population")
+        secilen = []
+        while len(secilen) < k:
+            i = self.randrange(len(dizi))
+            if i not in secilen:
+                secilen.append(i)
+        return [dizi[i] for i in secilen]
+
+    def choices(self, dizi, weights):
+        kumulatif = list(itertools.accumulate(weights))
+        i = bisect.bisect_right(kumulatif, self.random() * kumulatif[-1])
+        return [dizi[min(i, len(dizi) - 1)]]
@@ -0,0 +1,196 @@
+import time
+from collections import OrderedDict
+
+from aco import KarincaKolonisiOptimizasyonu
+from parallel_aco import CokluKoloni
+from stopping import DurmaKosulu
+from genetics import GenetikAlgoritma, ui_parametresi
+from iteration_trace import IterasyonIzi
+from island_ga import AdaModeli
+from result_writer import build_result
+from route_cache import route_key
+from seeding import tohum_oku, yeni_tohum
+
+# Parameter names follow aco_input.csv / genetic_input.csv; the UI's GA
+# names (populasyon, nesil, mutasyon) are accepted too, see UI_ADLARI
+ACO_VARSAYILAN = {
+    "karinca_sayisi": 30,
+    "iterasyon": 50,
+    "alfa": 1.0,
+    "beta": 2.0,
+    "buharlasma": 0.1,
+    "q_degeri": 100.0,
+    "koloni_sayisi": 1,
+    "paylasim_araligi": 10,
+    "paylasim_orani": 0.5,
+    "sicak_sifirlama": 0.8,
+    "aday_sayisi": 0,
+    "maks_min": 0,
+}
+
+GA_VARSAYILAN = {
+    "pop_size": 100,
+    "nesil_sayisi": 200,
+    "mutasyon_orani": 0.05,
+    "agirlikli_kuyruk": 0,
+    "ada_sayisi": 1,
+    "goc_araligi": 20,
+    "goc_sayisi": 2,
+    "cok_amacli": 0,
+    "memetik": 0,
+    "yerel_pencere": 4,
+}
+
+
+def _parametre(params, ad, varsayilan):
+    """Reads a parameter that may arrive as a CSV string or a JSON number."""
+    deger = ui_parametresi(params, ad, varsayilan)
+    return type(varsayilan)(float(deger)) if isinstance(varsayilan, int) else float(deger)
+
+
+def _sicak_butce(params, ad, soguk):
+    """Warm-start budget: the `ad` parameter, or a quarter of the cold one."""
+    deger = params.get(ad)
+    return max(1, int(float(deger)) if deger not in (None, "") else soguk // 4)
+
+
+def solve(network, algo, kaynak, hedef, agirliklar, params=None, bw_talep=0,
+          optimizerler=None, onbellek=None):
+    """
+    Runs one ACO or GA solve on an already loaded NetworkManager.
+    Returns the path, its metrics and the solve time as a plain dict.
+    With `bw_talep` > 0 only links with enough residual bandwidth are used.
+
+    `optimizerler` is an optional dict kept by the caller across solves. A
+    repeat of the same request on the same loaded topology then warm-starts
+    the single-process optimizer from its last pheromone / population, with
+    only the links changed since (update_edge, ...) invalidated, and runs
+    the shorter sicak_iterasyon / sicak_nesil budget.
+
+    Multi-colony runs add the per-colony and global convergence per epoch
+    ("koloniler", "global_gecmis"), island runs the per-island one ("adalar").
+
+    With a RouteCache as `onbellek`, a repeat of a stored request returns
+    the stored result at once ("onbellek": true). rota_onbellegi=0 in
+    params, or a trace request, always runs the search.
+    """
+    params = params or {}
+    agirliklar = tuple(float(w) for w in agirliklar)
+    if int(kaynak) == int(hedef):
+        raise ValueError(f"Source and target are the same node: {kaynak}")
+    indeksler = network.compiled.to_index([int(kaynak), int(hedef)])
+    for dugum, indeks in zip((kaynak, hedef), indeksler):
+        if indeks < 0:
+            raise ValueError(f"Unknown node: {dugum}")
+
+    # Stored result of the same request on the same topology
+    rota_anahtari = None
+    if onbellek is not None and not params.get("iz_dosyasi") and \
+            int(float(params.get("rota_onbellegi", 1))):
+        rota_anahtari = route_key(network, algo, kaynak, hedef, agirliklar, bw_talep,
+                                  {ad: v for ad, v in params.items() if ad != "rota_onbellegi"})
+        kayit = onbellek.get(rota_anahtari)
+        if kayit is not None:
+            return {**kayit, "onbellek": True}
+
+    # The exact optimum costs milliseconds; it gives the gap and optional seeding
+    optimum = network.solve_exact(int(kaynak), int(hedef), agirliklar, bw_talep)
+    baslangic = [optimum["path"]] if optimum["path"] and \
+        int(float(params.get("optimum_tohumla", 0))) else None
+
+    anahtar = (algo, int(kaynak), int(hedef), agirliklar, float(bw_talep),
+               tuple(sorted((ad, str(deger)) for ad, deger in params.items())))
+    onceki = (optimizerler or {}).get(anahtar)
+    if onceki is not None and isinstance(optimizerler, OrderedDict):
+        # Least recently used first, so a caller bounding the dict evicts cold entries
+        optimizerler.move_to_end(anahtar)
+    sicak = onceki is not None and onceki[1] is network.compiled
+
+    # One seed drives the whole run; without one a fresh seed is drawn and
+    # reported, so any run can be replayed with params["tohum"]
+    tohum = onceki[2] if sicak else tohum_oku(params)
+    tohum = yeni_tohum() if tohum is None else tohum
+
+    # Early stopping criteria come with the other algorithm parameters
+    durma = onceki[0].durma if sicak else DurmaKosulu.parametrelerden(params)
+
+    # Per-iteration trace; the island/colony modes only report per epoch
+    tekil = False
+
+    if algo == "aco":
+        p = {ad: _parametre(params, ad, v) for ad, v in ACO_VARSAYILAN.items()}
+        aco_parametreleri = dict(
+            karinca_sayisi=p["karinca_sayisi"], iterasyon_sayisi=p["iterasyon"],
+            alfa=p["alfa"], beta=p["beta"], buharlasma_orani=p["buharlasma"],
+            q_degeri=p["q_degeri"], bw_talep=bw_talep, baslangic_yollari=baslangic,
+            durma=durma, sicak_sifirlama=p["sicak_sifirlama"], tohum=tohum,
+            aday_sayisi=p["aday_sayisi"], maks_min=bool(p["maks_min"])
+        )
+        butce = dict(iterasyon_sayisi=_sicak_butce(params, "sicak_iterasyon", p["iterasyon"]))
+        if sicak:
+            optimizer, tekil = onceki[0], True
+        elif p["koloni_sayisi"] > 1:
+            optimizer = CokluKoloni(network, agirliklar, p["koloni_sayisi"],
+                                    p["paylasim_araligi"], p["paylasim_orani"],
+                                    **aco_parametreleri)
+        else:
+            optimizer = KarincaKolonisiOptimizasyonu(network, agirliklar, **aco_parametreleri)
+            tekil = True
+    elif algo == "ga":
+        p = {ad: _parametre(params, ad, v) for ad, v in GA_VARSAYILAN.items()}
+        ga_parametreleri = dict(
+            pop_size=p["pop_size"], nesil_sayisi=p["nesil_sayisi"],
+            mutasyon_orani=p["mutasyon_orani"], bw_talep=bw_talep,
+            baslangic_yollari=baslangic, agirlikli_kuyruk=bool(p["agirlikli_kuyruk"]),
+            durma=durma, tohum=tohum, memetik=bool(p["memetik"]),
+            yerel_pencere=p["yerel_pencere"]
+        )
+        butce = dict(nesil_sayisi=_sicak_butce(params, "sicak_nesil", p["nesil_sayisi"]))
+        if sicak:
+            optimizer, tekil = onceki[0], True
+        elif p["ada_sayisi"] > 1:
+            if p["cok_amacli"]:
+                raise ValueError("cok_amacli is not supported with ada_sayisi > 1")
+            optimizer = AdaModeli(network, agirliklar, p["ada_sayisi"],
+                                  p["goc_araligi"], p["goc_sayisi"], **ga_parametreleri)
+        else:
+            optimizer = GenetikAlgoritma(network, agirliklar, cok_amacli=bool(p["cok_amacli"]),
+                                         **ga_parametreleri)
+            tekil = True
+    else:
+        raise ValueError(f"Unknown algorithm: {algo}")
+
+    iz_dosyasi = params.get("iz_dosyasi")
+    if iz_dosyasi and tekil:
+        optimizer.iz = IterasyonIzi(iz_dosyasi, {"algo": algo, "kaynak": int(kaynak),
+                                                 "hedef": int(hedef)})
+    start_time = time.time()
+    try:
+        if sicak:
+            yol, _ = optimizer.calistir(int(kaynak), int(hedef), sicak=True, **butce)
+        else:
+            yol, _ = optimizer.calistir(int(kaynak), int(hedef))
+    finally:
+        if getattr(optimizer, "iz", None):
+            optimizer.iz.kapat()
+            optimizer.iz = None
+    if optimizerler is not None and tekil:
+        optimizerler[anahtar] = (optimizer, network.compiled, tohum)
+    sure = time.time() - start_time
+
+    sonuc = build_result(network, algo, kaynak, hedef, agirliklar, yol, sure, bw_talep,
+                         p, tohum, durma.ozet(), optimum)
+    sonuc["sicak"] = sicak
+    if isinstance(optimizer, CokluKoloni):
+        # Per-colony best per epoch and the global best per epoch
+        sonuc["koloniler"] = optimizer.rapor
+        sonuc["global_gecmis"] = optimizer.global_gecmis
+    elif isinstance(optimizer, AdaModeli):
+        sonuc["adalar"] = optimizer.rapor
+    if getattr(optimizer, "cok_amacli", False):
+        # Every trade-off of the run; the UI picks one without solving again
+        sonuc["pareto"] = optimizer.pareto_cephesi
+    if rota_anahtari is not None:
+        onbellek.put(rota_anahtari, network.topology_hash, sonuc)
+    sonuc["onbellek"] = False
+    return sonuc
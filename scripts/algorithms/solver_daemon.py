@@ -0,0 +1,173 @@
+"""
+Long-lived solver process for the Flutter UI.
+
+The topology is loaded once and kept in memory. Requests are JSON objects,
+one per line, read from stdin (default) or from a local TCP socket
+(--port). Every request gets exactly one JSON line back.
+
+    {"cmd": "solve", "id": 1, "algo": "aco", "kaynak": 0, "hedef": 249,
+     "agirliklar": [0.33, 0.33, 0.34], "params": {"iterasyon": 100}}
+    {"cmd": "update_edge", "kaynak": 3, "hedef": 7, "bandwidth": 200}
+    {"cmd": "remove_edge", "kaynak": 3, "hedef": 7}
+    {"cmd": "update_node", "dugum": 3, "reliability": 0.97}
+    {"cmd": "reload"}
+    {"cmd": "ping"}
+    {"cmd": "shutdown"}
+
+The CSVs are re-read automatically when their mtime changes. The update
+commands patch the loaded topology in memory only; the next solve of an
+already solved request then warm-starts from its previous optimizer state.
+Identical solve requests on an unchanged topology are answered from the
+route cache (<data>/.cache/routes.sqlite). A "bw_talep" (Mbps) in the
+request or in its params restricts the route to links with that much
+residual bandwidth.
+"""
+import argparse
+import contextlib
+import json
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from network_manager import NetworkManager
+from result_writer import json_safe
+from route_cache import RouteCache
+from solver import solve
+
+MAKS_OPTIMIZER = 16
+
+
+class SolverDaemon:
+    def __init__(self, network=None):
+        start_time = time.time()
+        self.network = network or NetworkManager()
+        self.mtimes = self.network.source_mtimes()
+        self.yukleme_suresi = time.time() - start_time
+        self.calisiyor = True
+        # Optimizers of recent requests, kept for warm starts
+        self.optimizerler = OrderedDict()
+        # Solved routes; keyed by the topology hash, so reloads need no flush
+        self.onbellek = RouteCache.for_folder(self.network.data_folder) \
+            if self.network.data_folder else RouteCache()
+
+    def reload(self):
+        start_time = time.time()
+        self.network.reload()
+        self.optimizerler.clear()
+        self.mtimes = self.network.source_mtimes()
+        self.yukleme_suresi = time.time() - start_time
+
+    def reload_if_changed(self):
+        """Reloads the topology if any CSV changed on disk. Returns True if it did."""
+        if self.network.source_mtimes() != self.mtimes:
+            self.reload()
+            return True
+        return False
+
+    def handle(self, istek):
+        cmd = istek.get("cmd", "solve")
+        cevap = {"id": istek.get("id"), "cmd": cmd}
+
+        try:
+            if cmd == "ping":
+                cevap["ok"] = True
+            elif cmd == "reload":
+                self.reload()
+                cevap.update(ok=True, yukleme_suresi=self.yukleme_suresi)
+            elif cmd == "shutdown":
+                self.calisiyor = False
+                cevap["ok"] = True
+            elif cmd == "update_edge":
+                self.network.update_edge(istek["kaynak"], istek["hedef"],
+                                         istek.get("bandwidth"), istek.get("link_delay"),
+                                         istek.get("reliability"))
+                cevap["ok"] = True
+            elif cmd == "remove_edge":
+                self.network.remove_edge(istek["kaynak"], istek["hedef"])
+                cevap["ok"] = True
+            elif cmd == "update_node":
+                self.network.update_node(istek["dugum"], istek.get("processing_delay"),
+                                         istek.get("reliability"))
+                cevap["ok"] = True
+            elif cmd == "solve":
+                yeniden_yuklendi = self.reload_if_changed()
+                agirliklar = istek.get("agirliklar", self.network.weights)
+                params = istek.get("params") or {}
+                bw_talep = float(istek.get("bw_talep", params.get("bw_talep", 0)))
+                sonuc = solve(self.network, istek.get("algo", "aco"),
+                              istek["kaynak"], istek["hedef"], agirliklar,
+                              params, bw_talep, optimizerler=self.optimizerler,
+                              onbellek=self.onbellek)
+                while len(self.optimizerler) > MAKS_OPTIMIZER:
+                    self.optimizerler.popitem(last=False)
+                cevap.update(sonuc)
+                cevap.update(ok=True, yeniden_yuklendi=yeniden_yuklendi)
+            else:
+                cevap.update(ok=False, hata=f"Unknown command: {cmd}")
+        except Exception as e:
+            cevap.update(ok=False, hata=str(e))
+
+        return json_safe(cevap)
+
+    def handle_line(self, satir):
+        try:
+            istek = json.loads(satir)
+        except json.JSONDecodeError as e:
+            return {"ok": False, "hata": f"Invalid JSON: {e}"}
+        return self.handle(istek)
+
+    def serve_stdio(self, girdi=sys.stdin, cikti=sys.stdout):
+        for satir in girdi:
+            if not satir.strip():
+                continue
+            cikti.write(json.dumps(self.handle_line(satir)) + "\n")
+            cikti.flush()
+            if not self.calisiyor:
+                break
+
+    def serve_socket(self, port, host="127.0.0.1"):
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for satir in self.rfile:
+                    satir = satir.decode("utf-8")
+                    if not satir.strip():
+                        continue
+                    cevap = json.dumps(daemon.handle_line(satir)) + "\n"
+                    self.wfile.write(cevap.encode("utf-8"))
+                    self.wfile.flush()
+                    if not daemon.calisiyor:
+                        # shutdown() waits for serve_forever, so call it off this thread
+                        threading.Thread(target=self.server.shutdown, daemon=True).start()
+                        return
+
+        with socketserver.TCPServer((host, port), Handler) as server:
+            server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Persistent ACO/GA solver")
+    parser.add_argument("--port", type=int, default=None,
+                        help="Serve on 127.0.0.1:PORT instead of stdin/stdout")
+    args = parser.parse_args()
+
+    # stdout carries the protocol; stray prints from the loaders go to stderr
+    protokol = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        daemon = SolverDaemon()
+        hazir = {"cmd": "ready", "ok": True, "yukleme_suresi": daemon.yukleme_suresi}
+        if args.port is not None:
+            hazir["port"] = args.port
+        print(json.dumps(hazir), file=protokol, flush=True)
+
+        if args.port is None:
+            daemon.serve_stdio(cikti=protokol)
+        else:
+            daemon.serve_socket(args.port)
+
+
+if __name__ == "__main__":
+    main()
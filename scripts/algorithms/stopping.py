@@ -0,0 +1,103 @@
+"""
+Stopping criteria shared by the ACO and GA loops.
+
+Every criterion is off unless its parameter is set (> 0), so a default
+DurmaKosulu runs the full iteration budget like before.
+
+    durgunluk_penceresi  iterations without improvement of the best fitness
+    hedef_fitness        stop once the best fitness is at or below this value
+    sure_limiti          wall-clock budget in seconds
+    min_cesitlilik       GA: share of distinct paths in the population (0-1)
+    min_entropi          ACO: normalized pheromone entropy (0-1)
+"""
+import time
+
+import numpy as np
+
+PARAMETRELER = ("durgunluk_penceresi", "hedef_fitness", "sure_limiti",
+                "min_cesitlilik", "min_entropi")
+
+
+class DurmaKosulu:
+    def __init__(self, durgunluk_penceresi=0, hedef_fitness=None, sure_limiti=0,
+                 min_cesitlilik=0, min_entropi=0):
+        self.durgunluk_penceresi = int(durgunluk_penceresi or 0)
+        self.hedef_fitness = hedef_fitness
+        self.sure_limiti = float(sure_limiti or 0)
+        self.min_cesitlilik = float(min_cesitlilik or 0)
+        self.min_entropi = float(min_entropi or 0)
+        self.baslat()
+
+    @classmethod
+    def parametrelerden(cls, params):
+        """Builds the criteria from an input CSV / JSON dict; missing or empty keys are off."""
+        degerler = {}
+        for ad in PARAMETRELER:
+            deger = (params or {}).get(ad)
+            if deger not in (None, ""):
+                degerler[ad] = float(deger)
+        return cls(**degerler)
+
+    def baslat(self):
+        """Resets the run state; call at the start of every run."""
+        self.baslangic = time.time()
+        self.en_iyi = float("inf")
+        self.son_iyilesme = 0
+        self.iterasyon = 0
+        self.durma_nedeni = "tamamlandi"
+        self.durma_iterasyonu = None
+
+    def kontrol(self, iterasyon, en_iyi_fitness, cesitlilik=None, entropi=None):
+        """
+        Records iteration `iterasyon` (1-based) and returns the reason to stop,
+        or None to continue. The reason is also kept in durma_nedeni.
+        """
+        self.iterasyon = iterasyon
+        if en_iyi_fitness < self.en_iyi:
+            self.en_iyi = en_iyi_fitness
+            self.son_iyilesme = iterasyon
+
+        neden = None
+        if self.hedef_fitness is not None and self.en_iyi <= self.hedef_fitness:
+            neden = "hedef_fitness"
+        elif self.durgunluk_penceresi and self.en_iyi != float("inf") and \
+                iterasyon - self.son_iyilesme >= self.durgunluk_penceresi:
+            neden = "durgunluk"
+        elif self.sure_limiti and time.time() - self.baslangic >= self.sure_limiti:
+            neden = "sure_limiti"
+        elif self.min_cesitlilik and cesitlilik is not None and cesitlilik < self.min_cesitlilik:
+            neden = "cesitlilik"
+        elif self.min_entropi and entropi is not None and entropi < self.min_entropi:
+            neden = "entropi"
+
+        if neden:
+            self.durma_nedeni = neden
+            self.durma_iterasyonu = iterasyon
+        return neden
+
+    def tamamla(self):
+        """Marks a run that used its whole budget."""
+        if self.durma_iterasyonu is None:
+            self.durma_iterasyonu = self.iterasyon
+
+    def ozet(self):
+        return {"durma_nedeni": self.durma_nedeni, "durma_iterasyonu": self.durma_iterasyonu}
+
+
+def populasyon_cesitliligi(populasyon):
+    """Share of distinct paths in a GA population (1.0 = all different)."""
+    if not populasyon:
+        return 0.0
+    return len({tuple(yol) for yol in populasyon}) / len(populasyon)
+
+
+def feromon_entropisi(feromon):
+    """Shannon entropy of the pheromone distribution, normalized to 0-1."""
+    feromon = np.asarray(feromon, dtype=np.float64)
+    if feromon.size < 2:
+        return 0.0
+    toplam = feromon.sum(axis=-1, keepdims=True)
+    p = feromon / np.where(toplam > 0, toplam, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = -np.where(p > 0, p * np.log(p), 0.0).sum(axis=-1)
+    return float(np.mean(h) / np.log(feromon.shape[-1]))
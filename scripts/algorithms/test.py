@@ -1,7 +1,24 @@
+"""
+Write diagnostic plus regression checks for the solvers.
 
+The checks build small synthetic topologies (benchmark.topoloji_uret) in a
+temporary folder, so they do not need or touch ../data:
+
+    python test.py
+    python -m pytest test.py
+"""
 import os
 import csv
 import sys
+import tempfile
+
+import numpy as np
+
+from benchmark import topoloji_uret
+from genetics import GenetikAlgoritma
+from network_manager import NetworkManager
+
+AGIRLIKLAR = (0.33, 0.33, 0.34)
 
 def test_write_permissions():
     print("Starting Write Diagnostic...")
@@ -47,5 +64,284 @@ def test_write_permissions():
     else:
         print("GHOST ERROR: Python didn't crash, but the file is missing.")
 
+def _ornek_ag(dugum_sayisi=120, ortalama_derece=6.0, tohum=3):
+    """A fresh NetworkManager over a random connected topology."""
+    klasor = tempfile.mkdtemp(prefix="qos_test_")
+    topoloji_uret(klasor, dugum_sayisi, ortalama_derece, tohum=tohum)
+    return NetworkManager(AGIRLIKLAR, data_folder=klasor, use_cache=False)
+
+
+def _referans_graf(klasor):
+    """networkx graph read line by line from the CSVs, as the original loaders did."""
+    import networkx as nx
+
+    G = nx.Graph()
+    with open(os.path.join(klasor, "nodes.csv"), encoding="utf-8") as f:
+        next(f)
+        for satir in f:
+            parca = satir.strip().split(";")
+            G.add_node(int(parca[0]), processing_delay=float(parca[1].replace(",", ".")),
+                       reliability=float(parca[2].replace(",", ".")))
+    with open(os.path.join(klasor, "edges.csv"), encoding="utf-8") as f:
+        next(f)
+        for satir in f:
+            parca = satir.strip().split(";")
+            G.add_edge(int(parca[0]), int(parca[1]), bandwidth=int(parca[2]),
+                       link_delay=int(parca[3]), reliability=float(parca[4].replace(",", ".")))
+    return G
+
+
+def _referans_fitness(G, yol, agirliklar):
+    """The original per-hop calculate_fitness loop over networkx attributes."""
+    if not yol or len(yol) < 2:
+        return float("inf")
+    gecikme = guvenilirlik = kaynak = 0.0
+    for dugum in yol[1:-1]:
+        gecikme += G.nodes[dugum]["processing_delay"]
+        guvenilirlik += -np.log(G.nodes[dugum]["reliability"])
+    for u, v in zip(yol, yol[1:]):
+        if not G.has_edge(u, v):
+            return float("inf")
+        kenar = G[u][v]
+        gecikme += kenar["link_delay"]
+        guvenilirlik += -np.log(kenar["reliability"])
+        kaynak += 1000.0 / kenar["bandwidth"]
+    return agirliklar[0] * gecikme + agirliklar[1] * guvenilirlik + agirliklar[2] * kaynak
+
+
+def test_fitness_batch_matches_reference():
+    """CompiledGraph.fitness_batch scores paths like the original networkx loop."""
+    import networkx as nx
+
+    network = _ornek_ag()
+    G = _referans_graf(network.data_folder)
+    rng = np.random.default_rng(0)
+    dugumler = list(G.nodes)
+    yollar = [[0], [], [0, 0], [dugumler[1], dugumler[2], dugumler[3]]]
+    for _ in range(50):
+        kaynak, hedef = rng.choice(dugumler, 2, replace=False).tolist()
+        yollar.append(nx.shortest_path(G, kaynak, hedef))
+        # A random walk, which mostly contains links that do not exist
+        yollar.append(rng.choice(dugumler, int(rng.integers(2, 8)), replace=False).tolist())
+
+    for agirliklar in (AGIRLIKLAR, (1.0, 0.0, 0.0), (0.2, 0.5, 0.3)):
+        toplu = network.calculate_fitness_batch(yollar, agirliklar)["fitness"]
+        for yol, fitness in zip(yollar, toplu):
+            beklenen = _referans_fitness(G, yol, agirliklar)
+            if np.isinf(beklenen):
+                assert np.isinf(fitness), yol
+            else:
+                assert abs(fitness - beklenen) < 1e-9 * max(1.0, beklenen), (yol, fitness, beklenen)
+
+
+def test_solve_exact_matches_networkx_dijkstra():
+    """solve_exact finds the same optimum as a networkx Dijkstra on the fitness terms."""
+    import networkx as nx
+
+    network = _ornek_ag()
+    G = _referans_graf(network.data_folder)
+    rng = np.random.default_rng(1)
+    dugumler = list(G.nodes)
+    for agirliklar in (AGIRLIKLAR, (0.7, 0.2, 0.1)):
+        for _ in range(20):
+            kaynak, hedef = rng.choice(dugumler, 2, replace=False).tolist()
+
+            def maliyet(u, v, kenar):
+                # Link terms, plus the node terms of v unless it is the target
+                c = (agirliklar[0] * kenar["link_delay"]
+                     - agirliklar[1] * np.log(kenar["reliability"])
+                     + agirliklar[2] * 1000.0 / kenar["bandwidth"])
+                if v != hedef:
+                    dugum = G.nodes[v]
+                    c += agirliklar[0] * dugum["processing_delay"] - agirliklar[1] * np.log(dugum["reliability"])
+                return c
+
+            beklenen = _referans_fitness(G, nx.dijkstra_path(G, kaynak, hedef, weight=maliyet), agirliklar)
+            sonuc = network.solve_exact(kaynak, hedef, agirliklar)
+            assert sonuc["path"][0] == kaynak and sonuc["path"][-1] == hedef
+            assert abs(sonuc["fitness"] - beklenen) < 1e-9 * max(1.0, beklenen), (kaynak, hedef)
+            assert abs(_referans_fitness(G, sonuc["path"], agirliklar) - sonuc["fitness"]) < 1e-9 * max(1.0, beklenen)
+
+
+def test_find_initial_paths_matches_networkx():
+    """Yen's paths are loopless, valid and as short as networkx's shortest simple paths."""
+    from itertools import islice
+
+    import networkx as nx
+
+    network = _ornek_ag()
+    G = _referans_graf(network.data_folder)
+    rng = np.random.default_rng(2)
+    dugumler = list(G.nodes)
+    for _ in range(20):
+        kaynak, hedef = rng.choice(dugumler, 2, replace=False).tolist()
+        yollar = network.find_initial_paths(kaynak, hedef, limit=5)
+        beklenen = [len(yol) for yol in islice(nx.shortest_simple_paths(G, kaynak, hedef), 5)]
+        assert [len(yol) for yol in yollar] == beklenen, (kaynak, hedef)
+        assert len({tuple(yol) for yol in yollar}) == len(yollar)
+        for yol in yollar:
+            assert yol[0] == kaynak and yol[-1] == hedef and len(set(yol)) == len(yol)
+            assert all(G.has_edge(u, v) for u, v in zip(yol, yol[1:]))
+    assert network.find_initial_paths(dugumler[0], -1) == []
+
+
+def test_route_cache_after_update_edge():
+    """A stored route is reused until the topology changes; warm re-solves see the change."""
+    from route_cache import RouteCache
+    from solver import solve
+
+    network = _ornek_ag()
+    onbellek = RouteCache()
+    optimizerler = {}
+    params = {"karinca_sayisi": 10, "iterasyon": 10, "tohum": 5}
+    ilk = solve(network, "aco", 0, 60, AGIRLIKLAR, params, optimizerler=optimizerler, onbellek=onbellek)
+    ikinci = solve(network, "aco", 0, 60, AGIRLIKLAR, params, optimizerler=optimizerler, onbellek=onbellek)
+    assert not ilk.get("onbellek") and ikinci["onbellek"]
+    assert ikinci["yol"] == ilk["yol"]
+
+    # Make the first link of the found path very slow
+    u, v = ilk["yol"][:2]
+    network.update_edge(u, v, link_delay=10 ** 6)
+    ucuncu = solve(network, "aco", 0, 60, AGIRLIKLAR, params, optimizerler=optimizerler, onbellek=onbellek)
+    assert not ucuncu.get("onbellek")
+    assert ucuncu["yol"][:2] != [u, v]
+    assert abs(ucuncu["fitness"] - network.calculate_fitness(ucuncu["yol"], AGIRLIKLAR)["fitness"]) < 1e-9
+
+
+def test_daemon_protocol():
+    """One JSON line back per request line, errors included; updates reach the next solve."""
+    import io
+    import json
+
+    from solver_daemon import SolverDaemon
+
+    daemon = SolverDaemon(_ornek_ag())
+    istekler = [
+        {"cmd": "ping", "id": 1},
+        {"cmd": "solve", "id": 2, "algo": "aco", "kaynak": 0, "hedef": 60,
+         "params": {"karinca_sayisi": 10, "iterasyon": 10, "tohum": 5}},
+        {"cmd": "solve", "id": 3, "algo": "ga", "kaynak": 0, "hedef": 9999},
+        {"cmd": "frobnicate", "id": 4},
+    ]
+    girdi = io.StringIO("\n".join(json.dumps(istek) for istek in istekler) + "\n{not json\n\n")
+    cikti = io.StringIO()
+    daemon.serve_stdio(girdi, cikti)
+    cevaplar = [json.loads(satir) for satir in cikti.getvalue().splitlines()]
+    assert [c.get("id") for c in cevaplar] == [1, 2, 3, 4, None]
+    assert [c["ok"] for c in cevaplar] == [True, True, False, False, False]
+    assert "9999" in cevaplar[2]["hata"] and "Invalid JSON" in cevaplar[4]["hata"]
+    yol = cevaplar[1]["yol"]
+    assert yol[0] == 0 and yol[-1] == 60
+
+    # Removing the first link of the route forces a new one
+    cevap = daemon.handle_line(json.dumps({"cmd": "remove_edge", "kaynak": yol[0], "hedef": yol[1]}))
+    assert cevap["ok"]
+    cevap = daemon.handle(dict(istekler[1], id=5))
+    assert cevap["ok"] and not cevap["onbellek"] and cevap["yol"][:2] != yol[:2]
+    assert daemon.handle({"cmd": "shutdown"})["ok"] and not daemon.calisiyor
+    daemon.onbellek.close()
+
+
+def test_result_files():
+    """JSON, NDJSON and the legacy CSV pair round-trip; no path means null metrics and no path file."""
+    from result_writer import build_result, read_results, write_legacy_csv, write_result, write_results
+
+    network = _ornek_ag()
+    klasor = network.data_folder
+    yol = network.solve_exact(0, 60, AGIRLIKLAR)["path"]
+    bulundu = build_result(network, "aco", 0, 60, AGIRLIKLAR, yol, 0.5, seed=7)
+    bulunamadi = build_result(network, "ga", 0, 60, AGIRLIKLAR, None, 0.25)
+    assert bulundu["optimallik_farki"] == 0.0 and np.isinf(bulunamadi["fitness"])
+
+    (okunan,) = read_results(write_result(os.path.join(klasor, "sonuc.json"), bulundu))
+    assert okunan == bulundu
+    okunanlar = read_results(write_results(os.path.join(klasor, "sonuclar.jsonl"), [bulundu, bulunamadi]))
+    assert okunanlar[0] == bulundu
+    assert okunanlar[1]["yol"] is None and okunanlar[1]["fitness"] is None
+    assert okunanlar[1]["resource_cost"] is None and okunanlar[1]["total_reliability"] == 0.0
+
+    cikti, yol_dosyasi = os.path.join(klasor, "out.csv"), os.path.join(klasor, "path.csv")
+    write_legacy_csv(bulundu, cikti, yol_dosyasi)
+    with open(cikti, encoding="utf-8") as f:
+        tablo = dict(csv.reader(f))
+    assert tablo["Kaynak"] == "0" and tablo["Tohum"] == "7"
+    assert tablo["Yol"].split(" → ") == [str(n) for n in yol]
+    with open(yol_dosyasi, encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [["step", "node_id"]] + [[str(i), str(n)] for i, n in enumerate(yol)]
+
+    write_legacy_csv(bulunamadi, cikti, yol_dosyasi)
+    with open(cikti, encoding="utf-8") as f:
+        assert dict(csv.reader(f))["Yol"] == "BULUNAMADI"
+    assert not os.path.exists(yol_dosyasi)
+    assert not [ad for ad in os.listdir(klasor) if ad.endswith(".tmp")]
+
+
+def test_updates_match_fresh_load():
+    """update_edge / remove_edge / update_node leave the same graph as reloading edited CSVs."""
+    network = _ornek_ag()
+    G = _referans_graf(network.data_folder)
+    kenarlar = sorted(G.edges)
+    degisen, silinen = kenarlar[3], kenarlar[10]
+    network.update_edge(*degisen, bandwidth=150, link_delay=40, reliability=0.9)
+    network.remove_edge(*silinen)
+    network.update_node(5, processing_delay=1.75, reliability=0.96)
+    G[degisen[0]][degisen[1]].update(bandwidth=150, link_delay=40, reliability=0.9)
+    G.remove_edge(*silinen)
+    G.nodes[5].update(processing_delay=1.75, reliability=0.96)
+
+    # The same changes written to disk and loaded from scratch
+    klasor = tempfile.mkdtemp(prefix="qos_test_")
+    with open(os.path.join(klasor, "nodes.csv"), "w", encoding="utf-8") as f:
+        f.write("node_id;s_ms;r_node\n")
+        for dugum, d in G.nodes(data=True):
+            f.write(f"{dugum};{d['processing_delay']};{d['reliability']}\n")
+    with open(os.path.join(klasor, "edges.csv"), "w", encoding="utf-8") as f:
+        f.write("src;dst;capacity_mbps;delay_ms;r_link\n")
+        for u, v, k in G.edges(data=True):
+            f.write(f"{u};{v};{k['bandwidth']};{k['link_delay']};{k['reliability']}\n")
+    taze = NetworkManager(AGIRLIKLAR, data_folder=klasor, use_cache=False)
+
+    rng = np.random.default_rng(4)
+    dugumler = list(G.nodes)
+    yollar = [list(degisen), list(silinen)]
+    for _ in range(30):
+        kaynak, hedef = rng.choice(dugumler, 2, replace=False).tolist()
+        assert network.solve_exact(kaynak, hedef) == taze.solve_exact(kaynak, hedef)
+        yollar += network.find_initial_paths(kaynak, hedef, limit=3)
+    for ag in (network, taze):
+        assert ag.calculate_fitness(list(silinen))["fitness"] == float("inf")
+    np.testing.assert_allclose(network.calculate_fitness_batch(yollar)["fitness"],
+                               taze.calculate_fitness_batch(yollar)["fitness"])
+    for kok in dugumler[:10]:
+        i, j = network.compiled.to_index([kok])[0], taze.compiled.to_index([kok])[0]
+        np.testing.assert_array_equal(
+            network.compiled.hop_distances(i)[network.compiled.to_index(dugumler)],
+            taze.compiled.hop_distances(j)[taze.compiled.to_index(dugumler)])
+
+
+def test_ga_rerun_after_update_edge():
+    """A rerun after update_edge must not score paths with stale cached fitness."""
+    network = _ornek_ag()
+    kaynak, hedef = 0, network.compiled.node_count - 1
+    ga = GenetikAlgoritma(network, AGIRLIKLAR, 40, 20, tohum=1)
+    yol, _ = ga.calistir(kaynak, hedef)
+    network.update_edge(yol[0], yol[1], link_delay=100000)
+
+    for sicak in (False, True):
+        yeni_yol, fitness = ga.calistir(kaynak, hedef, sicak=sicak)
+        gercek = network.calculate_fitness(yeni_yol, AGIRLIKLAR)["fitness"]
+        assert abs(fitness - gercek) < 1e-9, (sicak, fitness, gercek)
+        assert fitness < 100000
+
+
 if __name__ == "__main__":
-    test_write_permissions()
\ No newline at end of file
+    hatalar = 0
+    for ad, fonksiyon in list(globals().items()):
+        if ad.startswith("test_") and callable(fonksiyon):
+            try:
+                fonksiyon()
+                print(f"OK    {ad}")
+            except Exception as e:
+                hatalar += 1
+                print(f"FAIL  {ad}: {e!r}")
+    sys.exit(1 if hatalar else 0)
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+Bulk loader for the semicolon CSV topology with a binary snapshot cache.
+
+nodes.csv and edges.csv are parsed into NumPy columns in one pass and
+turned straight into a CompiledGraph. The arrays are then saved to
+<data>/.cache/topology.npz, keyed by the mtime, size and SHA-1 of both
+CSVs, so later runs skip parsing entirely.
+"""
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+
+from compiled_graph import CompiledGraph
+
+SNAPSHOT_VERSION = 1
+SOURCES = ('nodes.csv', 'edges.csv')
+
+
+def read_columns(file_path, column_count):
+    """
+    Parses a semicolon CSV (header skipped, comma or dot decimals) into a
+    float array of shape (rows, column_count). Short rows are skipped.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        text = file.read().replace(',', '.')
+
+    try:
+        table = np.loadtxt(io.StringIO(text), delimiter=';', skiprows=1,
+                           usecols=range(column_count), ndmin=2)
+    except ValueError:
+        # Ragged file: keep only the rows the line-by-line loader would accept
+        lines = text.splitlines()[1:]
+        lines = [line for line in lines if len(line.strip().split(';')) >= column_count]
+        if not lines:
+            return np.zeros((0, column_count))
+        table = np.loadtxt(io.StringIO('\n'.join(lines)), delimiter=';',
+                           usecols=range(column_count), ndmin=2)
+    return table.reshape(-1, column_count)
+
+
+def _file_signature(file_path):
+    stat = os.stat(file_path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def _file_hash(file_path):
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_compiled(node_table, edge_table):
+    """
+    Builds a CompiledGraph from parsed columns with networkx semantics:
+    a later row overwrites an earlier one for the same node or undirected
+    edge, and nodes that only appear in edges get default attributes.
+    """
+    node_ids_raw = node_table[:, 0].astype(np.int64)
+    src_raw = edge_table[:, 0].astype(np.int64)
+    dst_raw = edge_table[:, 1].astype(np.int64)
+
+    node_ids = np.unique(np.concatenate([node_ids_raw, src_raw, dst_raw]))
+    proc_delay = np.zeros(len(node_ids))
+    node_rel = np.full(len(node_ids), 0.99)
+    # Fancy assignment keeps the last value written for repeated ids
+    rows = np.searchsorted(node_ids, node_ids_raw)
+    proc_delay[rows] = node_table[:, 1]
+    node_rel[rows] = node_table[:, 2]
+
+    u = np.searchsorted(node_ids, src_raw)
+    v = np.searchsorted(node_ids, dst_raw)
+    lo, hi = np.minimum(u, v), np.maximum(u, v)
+    key = lo * max(len(node_ids), 1) + hi
+    # Last occurrence of every undirected pair wins
+    _, last_from_end = np.unique(key[::-1], return_index=True)
+    keep = np.sort(len(key) - 1 - last_from_end)
+
+    return CompiledGraph(node_ids, proc_delay, node_rel,
+                         u[keep], v[keep],
+                         edge_table[keep, 2], edge_table[keep, 3], edge_table[keep, 4])
+
+
+def _save_snapshot(path, compiled, meta):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp.npz'
+    np.savez(temp_path,
+             meta=np.array(json.dumps(meta)),
+             node_ids=compiled.node_ids,
+             node_processing_delay=compiled.node_processing_delay,
+             node_reliability=compiled.node_reliability,
+             edge_u=compiled.edge_u,
+             edge_v=compiled.edge_v,
+             edge_bandwidth=compiled.edge_bandwidth,
+             edge_delay=compiled.edge_delay,
+             edge_reliability=compiled.edge_reliability)
+    os.replace(temp_path, path)
+
+
+def _load_snapshot(path):
+    with np.load(path) as data:
+        meta = json.loads(str(data['meta']))
+        compiled = CompiledGraph(data['node_ids'], data['node_processing_delay'],
+                                 data['node_reliability'], data['edge_u'], data['edge_v'],
+                                 data['edge_bandwidth'], data['edge_delay'],
+                                 data['edge_reliability'])
+    return compiled, meta
+
+
+def load_topology(data_folder, use_cache=True):
+    """
+    Returns (compiled, topology_hash). Uses the snapshot when the CSVs are
+    unchanged (same mtime and size, or same content hash); otherwise parses
+    them and refreshes the snapshot. The hash is None if a CSV is missing.
+    """
+    paths = {name: os.path.join(data_folder, name) for name in SOURCES}
+    missing = [p for p in paths.values() if not os.path.exists(p)]
+    if missing:
+        # Same behaviour as the line loaders: report and load what exists
+        for file_path in missing:
+            print(f"Error: {file_path} not found.")
+        node_table = read_columns(paths['nodes.csv'], 3) \
+            if paths['nodes.csv'] not in missing else np.zeros((0, 3))
+        edge_table = read_columns(paths['edges.csv'], 5) \
+            if paths['edges.csv'] not in missing else np.zeros((0, 5))
+        return build_compiled(node_table, edge_table), None
+
+    snapshot_path = os.path.join(data_folder, '.cache', 'topology.npz')
+    signatures = {name: _file_signature(p) for name, p in paths.items()}
+
+    cached = None
+    if use_cache and os.path.exists(snapshot_path):
+        try:
+            cached = _load_snapshot(snapshot_path)
+        except (OSError, ValueError, KeyError):
+            cached = None
+
+    if cached is not None:
+        compiled, meta = cached
+        if meta.get('version') == SNAPSHOT_VERSION:
+            if meta.get('signatures') == signatures:
+                return compiled, meta['hash']
+            # Touched but not edited: same content, refresh the signatures only
+            hashes = {name: _file_hash(p) for name, p in paths.items()}
+            if meta.get('hashes') == hashes:
+                meta['signatures'] = signatures
+                _save_snapshot(snapshot_path, compiled, meta)
+                return compiled, meta['hash']
+
+    hashes = {name: _file_hash(p) for name, p in paths.items()}
+    compiled = build_compiled(read_columns(paths['nodes.csv'], 3),
+                              read_columns(paths['edges.csv'], 5))
+    topology_hash = hashlib.sha1(
+        ''.join(hashes[name] for name in SOURCES).encode('ascii')).hexdigest()
+
+    if use_cache:
+        meta = {'version': SNAPSHOT_VERSION, 'signatures': signatures,
+                'hashes': hashes, 'hash': topology_hash}
+        try:
+            _save_snapshot(snapshot_path, compiled, meta)
+        except OSError as e:
+            print(f"Warning: could not write topology snapshot: {e}")
+    return compiled, topology_hash